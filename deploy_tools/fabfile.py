@@ -1,53 +1,303 @@
-import random, string   
+import os, random, re, string
+from io import StringIO
 from fabric.contrib.files import append, exists
-from fabric.api import cd, env, local, run 
+from fabric.api import abort, cd, env, local, put, run, sudo
 
-REPO_URL = 'https://github.com/MassDo/obeyTheTestingGoat.git'
+# FAB_REPO_URL and FAB_KEY_FILENAME: e.g. deploying to localhost or a
+# local container from a clone (see provisioning_notes.md)
+REPO_URL = os.environ.get(
+    'FAB_REPO_URL', 'https://github.com/MassDo/obeyTheTestingGoat.git')
+KEEP_RELEASES = 5
+# loads the .env of the release (symlink to the site's one)
+PIPENV = 'PIPENV_VENV_IN_PROJECT=1 python3 -m pipenv'
 
-env.key_filename = ["/home/massdo/.ssh/massdo-to-do-list/dorian.pem"]
+env.key_filename = [os.environ.get(
+    'FAB_KEY_FILENAME', "/home/massdo/.ssh/massdo-to-do-list/dorian.pem")]
 
-def deploy():
+def deploy(db='sqlite', profile='sync', migrate='before'):
+    """
+    fab deploy:host=<USER_NAME>@<YOUR_DOMAIN>[,db=postgresql][,profile=gthread][,migrate=after]
+
+    Builds the local HEAD commit in releases/<commit>, reusing the
+    virtualenv and the collected static files of earlier releases when
+    their sources are the same, checks it boots, then points `current`
+    at it and restarts gunicorn. The migrations run before the switch
+    unless they break the running release (check_migrations), which
+    stops the deploy; migrate=after runs them after the switch instead.
+    """
+    if profile == 'async' and db != 'postgresql':
+        # a SQLite call blocks every greenlet of the worker
+        abort('profile=async needs db=postgresql')
     site_folder = f'/home/{env.user}/sites/{env.host}'
-    run(f'mkdir -p {site_folder}')
+    run(f'mkdir -p {site_folder}/releases '
+        f'{site_folder}/shared/venvs {site_folder}/shared/static')
     with cd(site_folder):
-        _get_latest_source()
-        _update_virtualenv()
-        _create_or_update_dotenv()
-        _update_static_files()
-        _update_database()
+        commit = _get_latest_source()
+        release = _create_release(site_folder, commit)
+        _update_virtualenv(site_folder, commit, release)
+        _create_or_update_dotenv(site_folder, db, profile)
+        if db == 'postgresql':
+            _create_postgres_database()
+    with cd(release):
+        _update_static_files(site_folder, commit)
+        workers = _update_gunicorn_config(profile)
+        _check_release()
+        if migrate != 'after':
+            _update_database(site_folder, commit, db, check=True)
+    _switch_current(site_folder, release)
+    if migrate == 'after':
+        # the running release sees the new schema until the restart
+        with cd(release):
+            _update_database(site_folder, commit, db, check=False)
+    if _restart_gunicorn():
+        _warm_up(2 * workers)
+    _prune_releases(site_folder)
 
 def _get_latest_source():
-    if exists('.git'):
-        run('git fetch')
+    # a clone without working tree, the releases are exported from it
+    if exists('repo'):
+        run('git -C repo fetch')
     else:
-        run(f'git clone {REPO_URL} .')
-    # get the hash of the last local commit
-    current_commit = local('git log -n 1 --format=%H', capture=True)
-    # blow any changes in the server's code directory 
-    # And pull the current_commit
-    run(f'git reset --hard {current_commit}')
-
-def _update_virtualenv():
-    if not exists(".venv"):
-        # if no '.env' install pipenv and add to PATH 
-        run('export PIPENV_VENV_IN_PROJECT=1 && \
-            python3 -m pip install pipenv && \
-            PYTHON_BIN_PATH="$(python3 -m site --user-base)/bin" && \
-            export PATH="$PATH:$PYTHON_BIN_PATH" && \
-            pipenv install -r requirements.txt')
-    run('pipenv install -r requirements.txt')  
-
-def _create_or_update_dotenv():
+        run(f'git clone --no-checkout {REPO_URL} repo')
+    # deploy the last local commit
+    return local('git log -n 1 --format=%H', capture=True)
+
+def _create_release(site_folder, commit):
+    release = f'{site_folder}/releases/{commit[:12]}'
+    if not exists(release):
+        run(f'rm -rf {release}.tmp && mkdir {release}.tmp && '
+            f'git -C repo archive {commit} | tar -x -C {release}.tmp && '
+            f'mv {release}.tmp {release}')
+    run(f'ln -sfn {site_folder}/.env {release}/.env')
+    # the newest release for _prune_releases, even when deployed again
+    run(f'touch {release}')
+    return release
+
+def _source_key(site_folder, commit, *paths):
+    """
+    Short hash of the git objects of `paths` at `commit`: it changes
+    with their content only.
+    """
+    objects = ' '.join(f'{commit}:{path}' for path in paths)
+    return run(
+        f'git -C {site_folder}/repo rev-parse {objects} | sha1sum | cut -c1-12')
+
+def _update_virtualenv(site_folder, commit, release):
+    # one virtualenv per version of the requirements, shared by releases
+    key = _source_key(site_folder, commit, 'requirements.txt', 'Pipfile.lock')
+    venv = f'{site_folder}/shared/venvs/{key}'
+    if not exists(f'{venv}/.installed'):
+        run(f'rm -rf {venv} && python3 -m venv {venv}')
+        run(f'{venv}/bin/pip install -r {release}/requirements.txt')
+        run(f'touch {venv}/.installed')
+    run(f'ln -sfn {venv} {release}/.venv')
+    # pipenv only runs the manage.py commands with the .env loaded
+    run('python3 -m pipenv --version || python3 -m pip install --user pipenv')
+
+def _db_name():
+    return env.host.replace('.', '_').replace('-', '_')
+
+def _create_or_update_dotenv(site_folder, db='sqlite', profile='sync'):
     append('.env', 'DJANGO_DEBUG_FALSE=y')
+    if db == 'postgresql':
+        run("sed -i '/^DJANGO_SQLITE_TUNING=/d' .env")
+    else:
+        append('.env', 'DJANGO_SQLITE_TUNING=y')
+    # shared by the releases
+    append('.env', f'DJANGO_SQLITE_PATH={site_folder}/db.sqlite3')
+    append('.env', 'DJANGO_LEAN=y')
+    # open event streams only cost a greenlet with gevent workers
+    if profile == 'async':
+        append('.env', 'DJANGO_EVENTS_STREAM=y')
+    else:
+        run("sed -i '/^DJANGO_EVENTS_STREAM=/d' .env")
     append('.env', f'SITENAME={env.host}')
     current_contents = run('cat .env')
     if 'DJANGO_SECRET_KEY' not in current_contents:
         pool = string.ascii_letters + string.punctuation + string.digits
         new_secret_key = ''.join(random.SystemRandom().choices(pool, k=50))
         append('.env', f'DJANGO_SECRET_KEY={new_secret_key}')
+    if db == 'postgresql':
+        append('.env', 'DJANGO_DB_ENGINE=postgresql')
+        append('.env', f'DJANGO_DB_NAME={_db_name()}')
+        append('.env', f'DJANGO_DB_USER={_db_name()}')
+        append('.env', 'DJANGO_DB_HOST=localhost')
+        # gevent: no persistent connections, one would stay open per
+        # greenlet that ever ran a query
+        conn_max_age = 0 if profile == 'async' else 600
+        run("sed -i '/^DJANGO_DB_CONN_MAX_AGE=/d' .env")
+        append('.env', f'DJANGO_DB_CONN_MAX_AGE={conn_max_age}')
+        if 'DJANGO_DB_PASSWORD' not in current_contents:
+            pool = string.ascii_letters + string.digits
+            password = ''.join(random.SystemRandom().choices(pool, k=32))
+            append('.env', f'DJANGO_DB_PASSWORD={password}')
+
+def _create_postgres_database():
+    name = _db_name()
+    password = run("grep DJANGO_DB_PASSWORD .env | cut -d= -f2")
+    # psql runs as postgres, which can't cd into the site folder
+    with cd('/'):
+        role_exists = sudo(
+            f"psql -tAc \"SELECT 1 FROM pg_roles WHERE rolname='{name}'\"",
+            user='postgres')
+        if role_exists.strip() != '1':
+            sudo(f"psql -c \"CREATE ROLE {name} LOGIN PASSWORD '{password}'\"",
+                user='postgres')
+        db_exists = sudo(
+            f"psql -tAc \"SELECT 1 FROM pg_database WHERE datname='{name}'\"",
+            user='postgres')
+        if db_exists.strip() != '1':
+            sudo(f'createdb --owner {name} {name}', user='postgres')
+
+def _update_static_files(site_folder, commit):
+    # collected once per version of the static files and their storage
+    key = _source_key(site_folder, commit, 'lists/static', 'superlists/storage.py')
+    static = f'{site_folder}/shared/static/{key}'
+    if not exists(static):
+        run(f'rm -rf {static}.tmp && '
+            f'DJANGO_STATIC_ROOT={static}.tmp {PIPENV} run ./manage.py collectstatic --noinput && '
+            f'mv {static}.tmp {static}')
+    run(f'ln -sfn {static} static')
+
+def _check_release():
+    # imports the settings and the apps and compiles the templates
+    # (LISTS_PREWARM_TEMPLATES): a broken release stops here, before
+    # the switch
+    run(f'{PIPENV} run ./manage.py check')
+
+def _update_database(site_folder, commit, db, check):
+    applied = f'{db}-' + _source_key(site_folder, commit, 'lists/migrations')
+    stamp = f'{site_folder}/.migrations'
+    if run(f'cat {stamp} 2>/dev/null || true') != applied:
+        if check:
+            # before the switch the running release must cope with the
+            # new schema until it restarts: fails the deploy otherwise
+            run(f'{PIPENV} run ./manage.py check_migrations')
+        run(f'{PIPENV} run ./manage.py migrate --noinput')
+        run(f'echo {applied} > {stamp}')
 
-def _update_static_files():
-    run('pipenv run ./manage.py collectstatic --noinput')
+GUNICORN_PROFILES = {
+    # one request at a time per process
+    'sync': lambda cpus: {'worker_class': 'sync', 'workers': 2 * cpus + 1},
+    # a few threads per process, e.g. for the coalesced writes
+    'gthread': lambda cpus: {
+        'worker_class': 'gthread', 'workers': cpus + 1, 'threads': 4},
+    # greenlets: many slow or concurrent connections per process, use
+    # PostgreSQL with DJANGO_DB_CONN_MAX_AGE=0 (one connection per greenlet)
+    # (no preload: gevent must patch the stdlib before Django is imported)
+    'async': lambda cpus: {
+        'worker_class': 'gevent', 'workers': cpus,
+        'worker_connections': 1000, 'preload_app': False},
+}
 
-def _update_database():
-    run('pipenv run ./manage.py migrate --noinput')
\ No newline at end of file
+GUNICORN_POST_FORK = """
+
+def post_fork(server, worker):
+    # psycopg2 is a C extension: make its waits go through the gevent loop
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning('psycogreen missing, database calls will block')
+        return
+    patch_psycopg()
+"""
+
+def gunicorn_settings(profile, cpus, host):
+    """Settings of `profile` for a host with `cpus` CPUs."""
+    settings = {
+        'bind': f'unix:/tmp/{host}.socket',
+        # load the app in the master, the workers share its memory
+        # (copy-on-write) and start faster
+        'preload_app': True,
+        'keepalive': 5,
+        'timeout': 30,
+        'graceful_timeout': 30,
+        # recycle workers to bound memory growth, not all at once
+        'max_requests': 1000,
+        'max_requests_jitter': 100,
+    }
+    settings.update(GUNICORN_PROFILES[profile](cpus))
+    return settings
+
+def gunicorn_config(profile, cpus, host):
+    """Text of the gunicorn.conf.py of `profile` for a host with `cpus` CPUs."""
+    settings = gunicorn_settings(profile, cpus, host)
+    lines = [f'# generated by fab deploy, profile {profile}, {cpus} CPUs']
+    lines += [f'{name} = {value!r}' for name, value in settings.items()]
+    config = '\n'.join(lines) + '\n'
+    if profile == 'async':
+        config += GUNICORN_POST_FORK
+    return config
+
+def _update_gunicorn_config(profile):
+    cpus = int(run('nproc'))
+    put(StringIO(gunicorn_config(profile, cpus, env.host)), 'gunicorn.conf.py')
+    return gunicorn_settings(profile, cpus, env.host)['workers']
+
+def nginx_config(host, user, micro_cache=False):
+    """Text of the nginx site of `host` from nginx.template.conf."""
+    template = os.path.join(os.path.dirname(__file__), 'nginx.template.conf')
+    with open(template) as f:
+        config = f.read()
+    if micro_cache:
+        config = re.sub(r'^#MICRO_CACHE ', '', config, flags=re.MULTILINE)
+    # nginx variable and zone names: no dots or dashes
+    config = config.replace('SITE_ID', re.sub(r'\W', '_', host))
+    return config.replace('DOMAIN', host).replace('USER_NAME', user)
+
+def configure_nginx(micro_cache=''):
+    """
+    fab configure_nginx:host=<USER_NAME>@<YOUR_DOMAIN>[,micro_cache=y]
+    """
+    site = f'/etc/nginx/sites-available/{env.host}'
+    config = nginx_config(env.host, env.user, bool(micro_cache))
+    put(StringIO(config), site, use_sudo=True)
+    sudo(f'ln -sfn {site} /etc/nginx/sites-enabled/{env.host}')
+    sudo('nginx -t && systemctl reload nginx')
+
+def _switch_current(site_folder, release):
+    # rename(2) replaces the link at once: `current` is never missing
+    run(f'ln -sfn {release} {site_folder}/current.tmp && '
+        f'mv -T {site_folder}/current.tmp {site_folder}/current')
+
+def _restart_gunicorn():
+    # The listening socket belongs to systemd (gunicorn-DOMAIN.socket):
+    # while the preloaded master restarts on the new code, connections
+    # wait in its backlog instead of being refused. In-flight requests
+    # get graceful_timeout to finish.
+    service = f'gunicorn-{env.host}.service'
+    if exists(f'/etc/systemd/system/{service}'):
+        sudo(f'systemctl restart {service}')
+        return True
+    return False
+
+def _warm_up(requests):
+    """
+    Make the first requests of the new workers (database connections,
+    per worker caches) ourselves, all at once so that they spread over
+    the workers.
+
+    Limitation: this runs after the restart, so visitors arriving
+    meanwhile still hit cold workers. Warming them before the switch
+    isn't possible with socket activation: systemd owns the listening
+    socket and the workers serving it only exist once the service has
+    restarted, so a process warmed on a side socket would not be the one
+    answering. What preload_app already does in the master before the
+    fork (imports, compiled templates) is shared by every worker.
+    """
+    run(f'seq {requests} | xargs -P {requests} -I{{}} '
+        f'curl -s -o /dev/null --unix-socket /tmp/{env.host}.socket '
+        f'-H "Host: {env.host}" http://localhost/')
+
+def _prune_releases(site_folder):
+    with cd(site_folder):
+        run(f'ls -1t releases | grep -v "\\.tmp$" | tail -n +{KEEP_RELEASES + 1} '
+            f'| sed "s|^|releases/|" | xargs -r rm -rf')
+        # then the virtualenvs and static files no release uses
+        in_use = set(run(
+            'readlink releases/*/.venv releases/*/static 2>/dev/null || true').split())
+        builds = run('ls -d $PWD/shared/venvs/* $PWD/shared/static/* '
+                     '2>/dev/null || true').split()
+        for build in builds:
+            if build not in in_use:
+                run(f'rm -rf {build}')
@@ -1,41 +1,85 @@
-import time, os
+import os
 
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
 from selenium import webdriver
-from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.keys import Keys
-
-MAX_WAIT = 1
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Waits end as soon as the page is right, so this is only paid on failure.
+MAX_WAIT = 5
+
+# Resolves once a row of the list table reads arguments[0]: checked on
+# each change of the page (MutationObserver) instead of every n seconds.
+# A page load interrupts the script, WebDriverWait then runs it again
+# on the new page.
+WAIT_FOR_ROW_SCRIPT = """
+var text = arguments[0], done = arguments[arguments.length - 1];
+function found() {
+    var table = document.getElementById('id_list_table');
+    return table !== null && Array.prototype.some.call(
+        table.getElementsByTagName('tr'),
+        function (row) { return row.innerText.trim() === text; });
+}
+if (found()) { return done(true); }
+var observer = new MutationObserver(function () {
+    if (found()) { observer.disconnect(); done(true); }
+});
+observer.observe(document, {childList: true, subtree: true});
+"""
+
+def new_browser():
+    options = webdriver.FirefoxOptions()
+    if 'FT_HEADED' not in os.environ:
+        options.add_argument('-headless')
+    browser = webdriver.Firefox(options=options)
+    browser.set_script_timeout(MAX_WAIT)
+    return browser
 
 class NewVisitorTest(StaticLiveServerTestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        One headless browser for all the tests of the class (and of a
+        process with manage.py test --parallel).
+        """
+        super().setUpClass()
+        cls.brow = new_browser()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.brow.quit()
+        super().tearDownClass()
+
     def setUp(self):
         """
         Actions before each test.
         """
-        self.brow = webdriver.Firefox()
         staging_server = os.environ.get('STAGING_SERVER')
         if staging_server:
             self.live_server_url = "http://" + staging_server
 
     def wait_for_row_in_list_table(self, row_text):
-        start_time = time.time()
-        while True:
-            try:    
-                table = self.brow.find_element_by_id('id_list_table')
-                rows = table.find_elements_by_tag_name('tr')
-                self.assertIn(row_text, [r.text for r in rows])
-                return
-            except (AssertionError, WebDriverException) as e:
-                if time.time() - start_time > MAX_WAIT:
-                    raise e
-                time.sleep(0.5)
+        try:
+            WebDriverWait(
+                self.brow, MAX_WAIT, poll_frequency=0.05,
+                ignored_exceptions=[WebDriverException],
+            ).until(lambda brow: brow.execute_async_script(
+                WAIT_FOR_ROW_SCRIPT, row_text))
+        except TimeoutException:
+            pass
+        # the assertion tells what the table has instead
+        table = self.brow.find_element_by_id('id_list_table')
+        rows = table.find_elements_by_tag_name('tr')
+        self.assertIn(row_text, [r.text for r in rows])
 
     def tearDown(self):
         """
-        Actions after each test.
+        Actions after each test: a new visitor for the next one.
         """
-        self.brow.quit()
+        self.brow.delete_all_cookies()
+        self.brow.get('about:blank')
 
     def test_can_start_a_list_and_retrieve_it_later_one_user(self):
         
@@ -98,11 +142,10 @@ class NewVisitorTest(StaticLiveServerTestCase):
 
         # Now a new user comes along the site (Francis)
 
-        ## We use a new browser session to make 
+        ## We clear the cookies of the browser to make
         ## sure that no informations of edith's
         ## is coming throught from cookies etc ...
-        self.brow.quit()
-        self.brow = webdriver.Firefox()
+        self.brow.delete_all_cookies()
 
         # Francis visits the home page.  There is no sign of Edith's
         # list
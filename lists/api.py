@@ -0,0 +1,160 @@
+"""
+JSON API for the lists, for clients that don't want the HTML forms:
+ids come back directly instead of a redirect, and items are serialized
+from values_list() rows rather than model instances.
+
+    POST /api/lists                    {"items": ["...", ...]}
+    GET  /api/lists/<id>
+    POST /api/lists/<id>/items         {"items": [...]} or {"text": "..."}
+    GET  /api/lists/<id>/items?after=<cursor>&limit=<n>
+    GET  /api/search?q=<words>[&list=<id>]
+"""
+import json
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+
+from lists import events
+from lists.cache import invalidate_list
+from lists.models import Item, ItemTooLong, List
+from lists.search import SearchUnavailable, search_items
+
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+def _texts_from_body(request):
+    try:
+        body = json.loads(request.body.decode('utf-8'))
+    except ValueError:
+        raise ApiError('Invalid JSON body')
+    if not isinstance(body, dict):
+        raise ApiError('Expected a JSON object')
+    texts = body.get('items', [body['text']] if 'text' in body else None)
+    if not isinstance(texts, list) or not all(
+            isinstance(text, str) for text in texts):
+        raise ApiError('Expected "text" or "items", an array of strings')
+    try:
+        for text in texts:
+            Item.check_text(text)
+    except ItemTooLong as error:
+        raise ApiError(str(error), 413)
+    return texts
+
+def _item_json(item_id, text, truncated):
+    # long items: the preview, the whole text is at /lists/<id>/items/<id>
+    if truncated:
+        return {'id': item_id, 'text': text, 'truncated': True}
+    return {'id': item_id, 'text': text}
+
+def _insert_items(list_id, texts):
+    """Insert the items and return their ids, in the caller transaction."""
+    items = [Item.from_text(text, list_id=list_id) for text in texts]
+    if connection.features.can_return_ids_from_bulk_insert:
+        Item.objects.bulk_create(items)
+    else:
+        # SQLite doesn't hand back the ids of a multi rows INSERT
+        for item in items:
+            item.save(force_insert=True)
+    return [item.id for item in items]
+
+
+@csrf_exempt
+@require_http_methods(['POST'])
+def create_list(request):
+    try:
+        texts = _texts_from_body(request) if request.body else []
+    except ApiError as error:
+        return _error(str(error), error.status)
+    with transaction.atomic():
+        list_ = List.objects.create(item_count=len(texts))
+        item_ids = _insert_items(list_.id, texts)
+    return JsonResponse({'id': list_.id, 'item_ids': item_ids}, status=201)
+
+@require_GET
+def list_detail(request, list_id):
+    list_ = List.objects.filter(id=list_id).values(
+        'id', 'item_count', 'updated_at').first()
+    if list_ is None:
+        return _error('No such list', 404)
+    return JsonResponse(list_)
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+def list_items(request, list_id):
+    try:
+        if request.method == 'POST':
+            return _add_items(request, list_id)
+        return _get_items(request, list_id)
+    except ApiError as error:
+        return _error(str(error), error.status)
+
+def _add_items(request, list_id):
+    texts = _texts_from_body(request)
+    with transaction.atomic():
+        # bumping the stamp doubles as the existence check of the list
+        touched = List.objects.filter(id=list_id).update(
+            updated_at=timezone.now(),
+            item_count=F('item_count') + len(texts),
+        )
+        if not touched:
+            raise ApiError('No such list', 404)
+        item_ids = _insert_items(list_id, texts)
+    invalidate_list(list_id)
+    events.publish(list_id)
+    return JsonResponse({'item_ids': item_ids}, status=201)
+
+def _get_items(request, list_id):
+    try:
+        after = int(request.GET.get('after', 0))
+        limit = min(int(request.GET.get('limit', API_PAGE_SIZE)),
+                    API_MAX_PAGE_SIZE)
+    except ValueError:
+        raise ApiError('after and limit must be integers')
+    if limit < 1:
+        raise ApiError('limit must be positive')
+    list_ = List.objects.filter(id=list_id).first()
+    if list_ is None:
+        raise ApiError('No such list', 404)
+    # an archived list may have items appended since: restore it whatever
+    # the page holds
+    list_.ensure_restored()
+    rows = list(
+        Item.objects.filter(list_id=list_id, id__gt=after)
+        .order_by('id').values_list('id', 'text', 'truncated')[:limit + 1]
+    )
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    return JsonResponse({
+        'items': [_item_json(*row) for row in rows],
+        'next': rows[-1][0] if has_next else None,
+    })
+
+
+@require_GET
+def search(request):
+    try:
+        list_id = int(request.GET['list']) if 'list' in request.GET else None
+    except ValueError:
+        return _error('list must be an integer', 400)
+    try:
+        rows = search_items(request.GET.get('q', ''), list_id=list_id)
+    except SearchUnavailable as error:
+        return _error(str(error), 501)
+    return JsonResponse({'items': [
+        {'id': item_id, 'list': item_list_id, 'text': text}
+        for item_id, item_list_id, text in rows
+    ]})
@@ -0,0 +1,9 @@
+from django.conf.urls import url
+from lists import api
+
+urlpatterns = [
+    url(r'^lists$', api.create_list, name='api_create_list'),
+    url(r'^lists/(\d+)$', api.list_detail, name='api_list_detail'),
+    url(r'^lists/(\d+)/items$', api.list_items, name='api_list_items'),
+    url(r'^search$', api.search, name='api_search'),
+]
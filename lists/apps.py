@@ -1,5 +1,24 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.template.loader import get_template
 
 
 class ListsConfig(AppConfig):
     name = 'lists'
+
+    def ready(self):
+        from superlists import db  # noqa: connects the database hooks
+        if settings.LISTS_PREWARM_TEMPLATES:
+            self.warm_templates()
+
+    def warm_templates(self):
+        """
+        Compile every template of the app, so the cached loader has them
+        before the first request (and before the fork with --preload).
+        """
+        template_dir = os.path.join(self.path, 'templates')
+        for name in sorted(os.listdir(template_dir)):
+            if name.endswith('.html'):
+                get_template(name)
@@ -0,0 +1,85 @@
+"""
+Cache of the rendered items table of a list.
+
+Fragments are keyed by list id, a per-list version, the list
+modification stamp and the page asked for. Writing to a list gives it
+a new version (`invalidate_list`) so the old fragments are never read
+again and just age out of the cache. The version only reaches the
+process that wrote when the cache is local (locmem, one per gunicorn
+worker): the stamp, read from the database, covers the writes made by
+the other processes.
+"""
+from collections import OrderedDict
+from itertools import islice
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends import locmem
+
+
+class LRULocMemCache(locmem.LocMemCache):
+    """
+    LocMemCache evicting the least recently used entries once
+    MAX_ENTRIES is reached (the stock one culls in arbitrary order).
+    """
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        if not isinstance(self._cache, OrderedDict):
+            self._cache = locmem._caches[name] = OrderedDict(self._cache)
+
+    def get(self, key, default=None, version=None, acquire_lock=True):
+        value = super().get(key, default, version, acquire_lock)
+        key = self.make_key(key, version=version)
+        with (self._lock.writer() if acquire_lock else locmem.dummy()):
+            if key in self._cache:
+                self._cache.move_to_end(key)
+        return value
+
+    def _set(self, key, value, timeout=locmem.DEFAULT_TIMEOUT):
+        super()._set(key, value, timeout)
+        self._cache.move_to_end(key)
+
+    def _cull(self):
+        if self._cull_frequency == 0:
+            return self.clear()
+        count = max(len(self._cache) // self._cull_frequency, 1)
+        for key in list(islice(self._cache, count)):
+            self._delete(key)
+
+
+def _cache():
+    return caches[settings.LISTS_CACHE]
+
+def _version_key(list_id):
+    return f'lists:version:{list_id}'
+
+def list_version(list_id):
+    cache = _cache()
+    version = cache.get(_version_key(list_id))
+    if version is None:
+        # a random version, so an evicted counter never brings back
+        # fragments rendered before it was lost
+        version = uuid4().hex
+        if not cache.add(_version_key(list_id), version, None):
+            version = cache.get(_version_key(list_id), version)
+    return version
+
+def invalidate_list(list_id):
+    _cache().set(_version_key(list_id), uuid4().hex, None)
+
+def cached_fragment(list_, page_key, render):
+    """
+    Return the fragment of `list_` for `page_key` from the cache,
+    calling `render()` and storing its result on a miss.
+    """
+    cache = _cache()
+    key = 'lists:table:{}:{}:{}:{}'.format(
+        list_.id, list_version(list_.id),
+        list_.updated_at.timestamp(), page_key)
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = render()
+        cache.set(key, fragment, settings.LISTS_CACHE_TIMEOUT)
+    return fragment
@@ -0,0 +1,106 @@
+"""
+Live updates of a list over Server-Sent Events (view_list page).
+
+The items table is the event log: the id of an item is its event id, so
+a client resumes after the last item it got (Last-Event-ID, sent back
+by EventSource when it reconnects) and nothing is lost between two
+connections. `publish` wakes the streams of the same process at once;
+streams served by other workers see the new items at their next check
+of the database, every LISTS_EVENTS_POLL seconds. No service outside
+the database is needed.
+
+With LISTS_EVENTS_STREAM (gevent workers, where a waiting stream is a
+greenlet) a stream stays open up to LISTS_EVENTS_TIMEOUT seconds.
+Without it, each request answers the pending items and ends, the
+browser reconnecting after `retry`: a sync worker is only busy for one
+query per subscriber and poll, never for the life of the stream.
+"""
+import json
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+
+from lists.models import Item
+
+EVENTS_BATCH = 500
+
+
+class Broker:
+    """
+    In-process notifications: a counter per list, bumped by `publish`,
+    that the streams wait on.
+    """
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._versions = Counter()
+
+    def publish(self, list_id):
+        with self._changed:
+            self._versions[list_id] += 1
+            self._changed.notify_all()
+
+    def version(self, list_id):
+        with self._changed:
+            return self._versions[list_id]
+
+    def wait(self, list_id, version, timeout):
+        """
+        Wait until the list is published past `version`, at most
+        `timeout` seconds. True if it was.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._versions[list_id] != version, timeout)
+
+
+broker = Broker()
+
+def publish(list_id):
+    broker.publish(int(list_id))
+
+def last_item_id(list_id):
+    return Item.objects.filter(list_id=list_id).order_by('-id').values_list(
+        'id', flat=True).first() or 0
+
+def format_event(item_id, text, truncated=False):
+    event = {'id': item_id, 'text': text}
+    if truncated:
+        event['truncated'] = True
+    data = json.dumps(event)
+    return f'id: {item_id}\nevent: item\ndata: {data}\n\n'
+
+def stream(list_id, after, keep_open=None):
+    """
+    Server-Sent Events of the items of a list added after the item id
+    `after`.
+    """
+    if keep_open is None:
+        keep_open = settings.LISTS_EVENTS_STREAM
+    poll = settings.LISTS_EVENTS_POLL
+    yield f'retry: {int(poll * 1000)}\n\n'
+    deadline = time.monotonic() + (
+        settings.LISTS_EVENTS_TIMEOUT if keep_open else 0)
+    while True:
+        version = broker.version(list_id)
+        items = list(
+            Item.objects.filter(list_id=list_id, id__gt=after)
+            .order_by('id').values_list('id', 'text', 'truncated')[:EVENTS_BATCH]
+        )
+        for item in items:
+            yield format_event(*item)
+        if items:
+            after = items[-1][0]
+            if len(items) == EVENTS_BATCH:
+                continue
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        # don't hold a database connection while waiting
+        connection.close()
+        if not broker.wait(list_id, version, min(poll, remaining)):
+            # a comment line: finds out closed connections
+            yield ': keep-alive\n\n'
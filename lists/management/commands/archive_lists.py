@@ -0,0 +1,65 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.utils import timezone
+
+from lists.models import List
+
+
+class Command(BaseCommand):
+    help = (
+        'Move the items of the lists neither viewed nor modified for --days '
+        'days to compressed archives, then VACUUM/ANALYZE the database. '
+        'Archived lists are restored when viewed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90)
+        parser.add_argument(
+            '--every', type=int, metavar='SECONDS',
+            help='Keep running, archiving every SECONDS seconds.')
+        parser.add_argument(
+            '--no-vacuum', action='store_true',
+            help="Don't compact the database afterward.")
+
+    def handle(self, days, every, no_vacuum, **options):
+        while True:
+            self.archive(days, vacuum=not no_vacuum)
+            if not every:
+                return
+            time.sleep(every)
+
+    def archive(self, days, vacuum=True):
+        cutoff = timezone.now() - timedelta(days=days)
+        cold_lists = List.objects.filter(
+            archived=False, item_count__gt=0,
+            updated_at__lt=cutoff, last_viewed_at__lt=cutoff,
+        )
+        lists = items = 0
+        for list_ in list(cold_lists.only('id')):
+            try:
+                # 0 if the list was viewed or added to in the meantime
+                archived = list_.archive(cutoff)
+            except OperationalError as error:
+                # e.g. the write lock not got in time: next run
+                self.stderr.write(f'List {list_.id} not archived: {error}')
+                continue
+            if archived:
+                items += archived
+                lists += 1
+        self.stdout.write(f'Archived {items} items of {lists} lists')
+        if lists and vacuum:
+            self.compact()
+
+    def compact(self):
+        start = time.perf_counter()
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('VACUUM')
+                cursor.execute('ANALYZE')
+            elif connection.vendor == 'postgresql':
+                cursor.execute('VACUUM ANALYZE lists_item')
+        self.stdout.write(
+            f'Database compacted in {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,331 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib import parse, request as urlrequest
+from urllib.error import HTTPError
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from lists.models import List
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values))), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies, wall_seconds, queries=None, errors=0, sizes=None,
+              cache_hits=None):
+    """
+    Summary of one endpoint run: latencies in seconds, wall time of the
+    whole run, the number of queries of each request (when known), the
+    size of the response bodies as received and the nginx cache hits.
+    """
+    ordered = sorted(latencies)
+    as_ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_second': (
+            round(len(latencies) / wall_seconds, 1) if wall_seconds else None),
+        'mean_ms': as_ms(sum(ordered) / len(ordered)) if ordered else None,
+        'p50_ms': as_ms(percentile(ordered, 50)),
+        'p95_ms': as_ms(percentile(ordered, 95)),
+        'p99_ms': as_ms(percentile(ordered, 99)),
+        'queries_per_request': (
+            round(sum(queries) / len(queries), 2) if queries else None),
+        'bytes_per_response': round(sum(sizes) / len(sizes)) if sizes else None,
+        'cache_hits': cache_hits,
+    }
+
+
+# Environment of each settings profile compared by --startup.
+PRODUCTION_ENV = {
+    'DJANGO_DEBUG_FALSE': 'y',
+    'DJANGO_SECRET_KEY': 'benchmark',
+    'SITENAME': 'localhost',
+}
+STARTUP_PROFILES = {
+    'development': {},
+    'production': PRODUCTION_ENV,
+    'lean': dict(PRODUCTION_ENV, DJANGO_LEAN='y'),
+}
+
+# Run in a fresh interpreter for each measure: time to boot the WSGI
+# application, then to serve the first and the following home pages.
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from superlists.wsgi import application
+booted = time.perf_counter()
+modules = len(sys.modules)
+from django.conf import settings
+from django.test import Client
+settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ['testserver']
+client = Client()
+client.get('/')
+first = time.perf_counter()
+for _ in range(50):
+    client.get('/')
+done = time.perf_counter()
+print(json.dumps({
+    'boot_seconds': booted - start,
+    'first_request_seconds': first - booted,
+    'request_seconds': (done - first) / 50,
+    'modules': modules,
+}))
+"""
+
+
+class _NoRedirect(urlrequest.HTTPRedirectHandler):
+    # the redirect after a POST is not part of the measured request
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpTarget:
+    """Requests sent over HTTP to a running server (runserver, gunicorn)."""
+
+    def __init__(self, base_url, compressed=False):
+        self.base_url = base_url.rstrip('/')
+        # bodies are measured as sent, compressed or not
+        self.accept_encoding = 'gzip, br' if compressed else 'identity'
+        # X-Cache-Status of the nginx micro-cache
+        self.cache_hits = 0
+        self.cookies = CookieJar()
+        self.opener = urlrequest.build_opener(
+            _NoRedirect, urlrequest.HTTPCookieProcessor(self.cookies))
+        # a CSRF cookie for the form POSTs
+        self.send('GET', '/')
+        self.csrf_token = next(
+            (c.value for c in self.cookies if c.name == 'csrftoken'), '')
+
+    def open(self, method, path, data=None, content_type=None):
+        headers = {
+            'X-CSRFToken': getattr(self, 'csrf_token', ''),
+            'Accept-Encoding': self.accept_encoding,
+        }
+        body = None
+        if content_type:
+            body = data.encode('utf-8')
+            headers['Content-Type'] = content_type
+        elif method == 'POST':
+            body = parse.urlencode(data or {}).encode('utf-8')
+        req = urlrequest.Request(
+            self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            response = self.opener.open(req)
+        except HTTPError as error:
+            response = error
+        with response:
+            return response.status, response.headers, response.read()
+
+    def send(self, method, path, data=None, content_type=None):
+        status, headers, body = self.open(method, path, data, content_type)
+        if headers.get('X-Cache-Status') == 'HIT':
+            self.cache_hits += 1
+        # the query count comes from superlists.metrics.TimingMiddleware
+        match = re.search(r'(\d+) queries', headers.get('Server-Timing', ''))
+        return status, body, int(match.group(1)) if match else None
+
+    def create_list(self, size):
+        _, headers, _ = self.open('POST', '/lists/new', {'item_text': 'item 0'})
+        list_id = int(headers['Location'].rstrip('/').rsplit('/', 1)[-1])
+        if size > 1:
+            self.open(
+                'POST', f'/lists/{list_id}/add_items',
+                '\n'.join(f'item {n}' for n in range(1, size)), 'text/plain')
+        return list_id
+
+
+class InProcessTarget:
+    """Requests sent through the Django test client, queries counted."""
+
+    def __init__(self):
+        self.client = Client()
+
+    def send(self, method, path, data=None, content_type=None):
+        with CaptureQueriesContext(connection) as queries:
+            if method == 'GET':
+                response = self.client.get(path)
+            elif content_type:
+                response = self.client.post(path, data, content_type)
+            else:
+                response = self.client.post(path, data or {})
+        return response.status_code, response.content, len(queries)
+
+    def create_list(self, size):
+        list_ = List.objects.create()
+        list_.add_items(f'item {n}' for n in range(size))
+        return list_.id
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the list endpoints and print p50/p95/p99 latencies, '
+        'requests per second and queries per request as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help='Base URL of a running server. By default requests go '
+                 'through the Django test client on a throwaway database.')
+        parser.add_argument('--requests', type=int, default=200,
+            help='Requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--list-size', type=int, default=1000,
+            help='Items in the list viewed and added to.')
+        parser.add_argument(
+            '--compressed', action='store_true',
+            help='With --url, accept gzip/brotli answers (e.g. from nginx).')
+        parser.add_argument('--output', help='Write the JSON report there.')
+        parser.add_argument(
+            '--startup', action='store_true',
+            help='Compare worker boot and home page times of the settings '
+                 'profiles instead (fresh interpreter each time).')
+        parser.add_argument('--repeat', type=int, default=5,
+            help='Interpreters started per profile with --startup.')
+
+    def handle(self, **options):
+        if options['startup']:
+            report = self.run_startup(options['repeat'])
+        elif options['url']:
+            report = self.run(
+                lambda: HttpTarget(options['url'], options['compressed']),
+                options)
+        else:
+            report = self.run_in_process(options)
+        report_json = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(report_json + '\n')
+        else:
+            self.stdout.write(report_json)
+
+    def run_startup(self, repeat):
+        report = {'mode': 'startup', 'repeat': repeat, 'profiles': {}}
+        # the production storage needs collected static files (manifest)
+        static_root = tempfile.mkdtemp()
+        try:
+            for profile, profile_env in STARTUP_PROFILES.items():
+                env = {
+                    name: value for name, value in os.environ.items()
+                    if name not in ('DJANGO_DEBUG_FALSE', 'DJANGO_LEAN',
+                                    'DJANGO_SETTINGS_MODULE')
+                }
+                env.update(profile_env, DJANGO_STATIC_ROOT=static_root)
+                if 'DJANGO_DEBUG_FALSE' in env:
+                    subprocess.check_call(
+                        [sys.executable, 'manage.py', 'collectstatic',
+                         '--noinput', '--verbosity', '0'],
+                        env=env, cwd=settings.BASE_DIR)
+                runs = [
+                    json.loads(subprocess.check_output(
+                        [sys.executable, '-c', STARTUP_SCRIPT],
+                        env=env, cwd=settings.BASE_DIR,
+                        stderr=subprocess.DEVNULL))
+                    for _ in range(repeat)
+                ]
+                report['profiles'][profile] = {
+                    key.replace('_seconds', '_ms'):
+                        round(sum(run[key] for run in runs) / repeat
+                              * (1000 if key.endswith('_seconds') else 1), 3)
+                    for key in runs[0]
+                }
+        finally:
+            shutil.rmtree(static_root, ignore_errors=True)
+        return report
+
+    def run_in_process(self, options):
+        # a file database, so concurrent threads behave as real workers
+        # do (the default in-memory test database can't)
+        old_name = connection.settings_dict['NAME']
+        test_dir = tempfile.mkdtemp()
+        connection.settings_dict['TEST']['NAME'] = os.path.join(
+            test_dir, 'benchmark.sqlite3')
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        settings.ALLOWED_HOSTS = list(settings.ALLOWED_HOSTS) + ['testserver']
+        try:
+            return self.run(InProcessTarget, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(test_dir, ignore_errors=True)
+
+    def run(self, make_target, options):
+        target = make_target()
+        list_id = target.create_list(options['list_size'])
+        endpoints = [
+            ('home', 'GET', '/', None),
+            ('new_list', 'POST', '/lists/new', {'item_text': 'new item'}),
+            ('view_list', 'GET', f'/lists/{list_id}/', None),
+            ('add_item', 'POST', f'/lists/{list_id}/add_item',
+                {'item_text': 'new item'}),
+        ]
+        report = {
+            'mode': 'http' if options['url'] else 'in-process',
+            'url': options['url'],
+            'compressed': options['compressed'],
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'list_size': options['list_size'],
+            'debug': settings.DEBUG,
+            'endpoints': {},
+        }
+        for name, method, path, data in endpoints:
+            report['endpoints'][name] = dict(
+                method=method, path=path,
+                **self.run_endpoint(make_target, method, path, data, options))
+        return report
+
+    def run_endpoint(self, make_target, method, path, data, options):
+        concurrency = options['concurrency']
+        per_thread = [
+            options['requests'] // concurrency
+            + (1 if n < options['requests'] % concurrency else 0)
+            for n in range(concurrency)
+        ]
+        # one client per thread, each with its own cookies and connection
+        targets = [make_target() for _ in range(concurrency)]
+
+        def worker(target, count):
+            results = []
+            for _ in range(count):
+                start = time.perf_counter()
+                status, body, queries = target.send(method, path, data)
+                results.append(
+                    (time.perf_counter() - start, status, queries, len(body)))
+            connection.close()
+            return results
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = [
+                result
+                for results in executor.map(worker, targets, per_thread)
+                for result in results
+            ]
+        wall = time.perf_counter() - start
+        queries = [q for _, _, q, _ in results if q is not None]
+        return summarize(
+            [latency for latency, _, _, _ in results], wall, queries,
+            errors=sum(1 for _, status, _, _ in results if status >= 400),
+            sizes=[size for _, _, _, size in results],
+            cache_hits=(
+                sum(target.cache_hits for target in targets)
+                if options['url'] else None),
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.migrations import operations
+from django.db.migrations.executor import MigrationExecutor
+
+
+def breaking_change(operation):
+    """
+    Why the code of the previous release fails once `operation` is
+    applied, or None.
+    """
+    if isinstance(operation, operations.AddField):
+        field = operation.field
+        # Django 1.11 drops the database default right after filling
+        # the column: the INSERTs of the old code, which leave it out,
+        # fail on a NOT NULL one
+        if not field.null and not field.many_to_many:
+            return (f'adds the NOT NULL column '
+                    f'{operation.model_name}.{operation.name}')
+    if isinstance(operation, (operations.RemoveField, operations.RenameField,
+                              operations.DeleteModel, operations.RenameModel)):
+        return operation.describe()
+    return None
+
+
+def _model_name(operation):
+    if isinstance(operation, operations.RenameModel):
+        return operation.old_name_lower
+    return getattr(operation, 'model_name_lower', None) or getattr(
+        operation, 'name_lower', None)
+
+
+class Command(BaseCommand):
+    help = (
+        'Fail if a migration still to apply breaks the code of the release '
+        'running now. fab deploy runs it before migrating ahead of the '
+        'switch.'
+    )
+
+    def handle(self, **options):
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        problems = []
+        # tables created by the plan itself (first deploy, new models):
+        # the running release doesn't use them
+        new_models = set()
+        for migration, backwards in plan:
+            for operation in migration.operations:
+                model = (migration.app_label, _model_name(operation))
+                if isinstance(operation, operations.CreateModel):
+                    new_models.add(model)
+                    continue
+                change = breaking_change(operation)
+                if change and model not in new_models:
+                    problems.append(
+                        f'{migration.app_label}.{migration.name} {change}')
+        if problems:
+            raise CommandError(
+                'Migrations breaking the running release:\n  '
+                + '\n  '.join(problems)
+                + '\nDeploy with migrate=after (errors until the restart).')
+        self.stdout.write(f'{len(plan)} migrations to apply, none breaking')
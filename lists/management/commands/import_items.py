@@ -0,0 +1,78 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from lists.cache import invalidate_list
+from lists.models import Item, ItemTooLong, List
+
+
+class Command(BaseCommand):
+    help = (
+        'Import items into a list from a file with one item per line '
+        '(or a JSON array with --json). Use - to read stdin.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('list_id', type=int)
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--json', action='store_true',
+            help='The file holds a JSON array of texts.')
+
+    def handle(self, list_id, path, batch_size, **options):
+        try:
+            list_ = List.objects.get(id=list_id)
+        except List.DoesNotExist:
+            raise CommandError(f'List {list_id} does not exist')
+
+        source = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        with source:
+            if options['json']:
+                texts = self._json_texts(source)
+            else:
+                texts = self._lines(source)
+            start = time.perf_counter()
+            try:
+                created = list_.add_items(texts, batch_size=batch_size)
+            except UnicodeDecodeError:
+                raise CommandError('Not a UTF-8 file, nothing imported')
+            seconds = time.perf_counter() - start
+        invalidate_list(list_.id)
+
+        rate = created / seconds if seconds else 0
+        self.stdout.write(
+            f'Imported {created} items into list {list_.id} '
+            f'in {seconds:.3f}s ({rate:.0f} items/s)')
+
+    def _json_texts(self, source):
+        # checked whole before the import: it is in memory anyway
+        try:
+            texts = json.load(source)
+        except ValueError as error:
+            raise CommandError(f'Invalid JSON: {error}')
+        if not isinstance(texts, list):
+            raise CommandError('Expected a JSON array of strings')
+        for index, text in enumerate(texts):
+            if not isinstance(text, str):
+                raise CommandError(
+                    f'Item {index}: expected a string, nothing imported')
+            self._check_text(text, f'Item {index}')
+        return texts
+
+    def _lines(self, source):
+        # streamed: the file is never loaded whole in memory, an error
+        # rolls back the items already inserted
+        for number, line in enumerate(source, 1):
+            if line.strip():
+                text = line.rstrip('\r\n')
+                self._check_text(text, f'Line {number}')
+                yield text
+
+    def _check_text(self, text, where):
+        try:
+            Item.check_text(text)
+        except ItemTooLong as error:
+            raise CommandError(f'{where}: {error}, nothing imported')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from lists.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Drop and rebuild the full-text index of the items.'
+
+    def handle(self, **options):
+        rebuild_index()
+        self.stdout.write('Search index rebuilt')
@@ -0,0 +1,42 @@
+"""
+Size limit of the request bodies, checked from their Content-Length
+before anything reads them (CsrfViewMiddleware reads request.POST):
+an oversized paste is refused without being buffered by the worker.
+
+The single item forms (new_list, add_item) get LISTS_MAX_FORM_SIZE
+bytes, the bulk endpoints and the API DATA_UPLOAD_MAX_MEMORY_SIZE.
+"""
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+
+FORM_VIEWS = ('new_list', 'add_item')
+
+
+def body_limit(path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    if match.url_name in FORM_VIEWS:
+        return settings.LISTS_MAX_FORM_SIZE
+    return settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+
+
+class RequestSizeLimitMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length:
+            limit = body_limit(request.path_info)
+            if limit is not None and length > limit:
+                return HttpResponse(
+                    f'Request body over {limit} bytes', status=413,
+                    content_type='text/plain')
+        return self.get_response(request)
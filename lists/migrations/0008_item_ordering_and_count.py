@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 19:07
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def count_items(apps, schema_editor):
+    List = apps.get_model('lists', 'List')
+    counts = List.objects.annotate(
+        count=models.Count('item')).filter(count__gt=0).values_list('id', 'count')
+    for list_id, count in list(counts):
+        List.objects.filter(id=list_id).update(item_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0007_list_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='item',
+            options={'ordering': ['id']},
+        ),
+        migrations.AddField(
+            model_name='list',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_items, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['list', 'id'], name='lists_item_list_id_6b2b67_idx'),
+        ),
+    ]
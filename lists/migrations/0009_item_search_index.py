@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+# the index as of this migration, frozen: lists.search holds the current
+# one (0012)
+SQLITE_INDEX = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS lists_item_fts USING fts5(
+        text, content='lists_item', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_insert
+        AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_delete
+        AFTER DELETE ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_update
+        AFTER UPDATE OF text ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    "INSERT INTO lists_item_fts(lists_item_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP_INDEX = [
+    'DROP TRIGGER IF EXISTS lists_item_fts_insert',
+    'DROP TRIGGER IF EXISTS lists_item_fts_delete',
+    'DROP TRIGGER IF EXISTS lists_item_fts_update',
+    'DROP TABLE IF EXISTS lists_item_fts',
+]
+POSTGRES_INDEX = [
+    """CREATE INDEX IF NOT EXISTS lists_item_text_search
+        ON lists_item USING GIN (to_tsvector('simple', text))""",
+]
+POSTGRES_DROP_INDEX = ['DROP INDEX IF EXISTS lists_item_text_search']
+
+
+def _execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def install_index(apps, schema_editor):
+    _execute(schema_editor, {
+        'sqlite': SQLITE_INDEX, 'postgresql': POSTGRES_INDEX})
+
+
+def drop_index(apps, schema_editor):
+    _execute(schema_editor, {
+        'sqlite': SQLITE_DROP_INDEX, 'postgresql': POSTGRES_DROP_INDEX})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0008_item_ordering_and_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_index, drop_index),
+    ]
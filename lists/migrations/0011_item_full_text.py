@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.29 on 2026-10-18 19:29
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+# the triggers of the search index of 0009, frozen
+SQLITE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_insert
+        AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_delete
+        AFTER DELETE ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_update
+        AFTER UPDATE OF text ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+]
+
+
+def install_index(apps, schema_editor):
+    # adding (or removing) columns remakes lists_item on SQLite, which
+    # drops the triggers of the search index (PostgreSQL keeps them)
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0010_list_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, install_index),
+        migrations.AddField(
+            model_name='item',
+            name='full_text',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='truncated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(install_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import zlib
+
+from django.db import migrations
+
+# the indexes of 0009 and of this migration, frozen: lists.search holds
+# the current one
+OLD_SQLITE_INDEX = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS lists_item_fts USING fts5(
+        text, content='lists_item', content_rowid='id')""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_insert
+        AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_delete
+        AFTER DELETE ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_update
+        AFTER UPDATE OF text ON lists_item BEGIN
+        INSERT INTO lists_item_fts(lists_item_fts, rowid, text)
+            VALUES ('delete', old.id, old.text);
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    "INSERT INTO lists_item_fts(lists_item_fts) VALUES ('rebuild')",
+]
+OLD_POSTGRES_INDEX = [
+    """CREATE INDEX IF NOT EXISTS lists_item_text_search
+        ON lists_item USING GIN (to_tsvector('simple', text))""",
+]
+SQLITE_INDEX = [
+    # keeps its own copy of the texts: a contentless table can't drop a
+    # row without being given its text (before SQLite 3.43)
+    'CREATE VIRTUAL TABLE IF NOT EXISTS lists_item_fts USING fts5(text)',
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_insert
+        AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_delete
+        AFTER DELETE ON lists_item BEGIN
+        DELETE FROM lists_item_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_update
+        AFTER UPDATE OF text ON lists_item BEGIN
+        UPDATE lists_item_fts SET text = new.text WHERE rowid = new.id;
+    END""",
+    'INSERT INTO lists_item_fts(rowid, text) SELECT id, text FROM lists_item',
+]
+SQLITE_DROP_INDEX = [
+    'DROP TRIGGER IF EXISTS lists_item_fts_insert',
+    'DROP TRIGGER IF EXISTS lists_item_fts_delete',
+    'DROP TRIGGER IF EXISTS lists_item_fts_update',
+    'DROP TABLE IF EXISTS lists_item_fts',
+]
+POSTGRES_INDEX = [
+    """CREATE TABLE IF NOT EXISTS lists_item_search (
+        item_id integer PRIMARY KEY, document tsvector NOT NULL)""",
+    """CREATE INDEX IF NOT EXISTS lists_item_search_document
+        ON lists_item_search USING GIN (document)""",
+    """CREATE OR REPLACE FUNCTION lists_item_search_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM lists_item_search WHERE item_id = old.id;
+        ELSE
+            INSERT INTO lists_item_search
+                VALUES (new.id, to_tsvector('simple', new.text))
+                ON CONFLICT (item_id) DO UPDATE SET document = excluded.document;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    """CREATE TRIGGER lists_item_search_sync
+        AFTER INSERT OR DELETE OR UPDATE OF text ON lists_item
+        FOR EACH ROW EXECUTE PROCEDURE lists_item_search_sync()""",
+    """INSERT INTO lists_item_search
+        SELECT id, to_tsvector('simple', text) FROM lists_item""",
+]
+POSTGRES_DROP_INDEX = [
+    'DROP TRIGGER IF EXISTS lists_item_search_sync ON lists_item',
+    'DROP FUNCTION IF EXISTS lists_item_search_sync()',
+    'DROP TABLE IF EXISTS lists_item_search',
+]
+POSTGRES_DROP_OLD_INDEX = ['DROP INDEX IF EXISTS lists_item_text_search']
+INDEX_FULL_TEXT = {
+    'sqlite': 'UPDATE lists_item_fts SET text = %s WHERE rowid = %s',
+    'postgresql': """UPDATE lists_item_search
+        SET document = to_tsvector('simple', %s) WHERE item_id = %s""",
+}
+
+
+def _execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def reinstall_index(apps, schema_editor):
+    # the index of 0009 only covers Item.text, the previews of the long
+    # items: replaced by one fed with their whole text
+    _execute(schema_editor, {
+        'sqlite': SQLITE_DROP_INDEX,
+        'postgresql': POSTGRES_DROP_OLD_INDEX + POSTGRES_INDEX,
+    })
+    _execute(schema_editor, {'sqlite': SQLITE_INDEX})
+    sql = INDEX_FULL_TEXT.get(schema_editor.connection.vendor)
+    if sql is None:
+        return
+    connection = schema_editor.connection
+    with connection.cursor() as cursor, connection.cursor() as update:
+        cursor.execute(
+            'SELECT id, full_text FROM lists_item WHERE truncated ORDER BY id')
+        while True:
+            batch = cursor.fetchmany(500)
+            if not batch:
+                break
+            update.executemany(sql, [
+                (zlib.decompress(full_text).decode('utf-8'), item_id)
+                for item_id, full_text in batch])
+
+
+def restore_old_index(apps, schema_editor):
+    _execute(schema_editor, {
+        'sqlite': SQLITE_DROP_INDEX + OLD_SQLITE_INDEX,
+        'postgresql': POSTGRES_DROP_INDEX + OLD_POSTGRES_INDEX,
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lists', '0011_item_full_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(reinstall_index, restore_old_index),
+    ]
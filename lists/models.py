@@ -1,10 +1,224 @@
-from django.db import models
+import json
+import zlib
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.utils import timezone
+
+from lists import search
+
+
+class ItemTooLong(ValueError):
+    """An item text over LISTS_MAX_ITEM_SIZE characters."""
 
 # Create your models here.
 class List(models.Model):
-    pass
+    # modification stamp of the list, bumped each time an item is added
+    updated_at = models.DateTimeField(auto_now=True)
+    # denormalized count of items, kept up to date by the write paths
+    item_count = models.PositiveIntegerField(default=0)
+    # last time the list was viewed, stamped at most once a day
+    last_viewed_at = models.DateTimeField(default=timezone.now)
+    # the items were moved to a ListArchive
+    archived = models.BooleanField(default=False)
+
+    def add_items(self, texts, batch_size=500):
+        """
+        Insert `texts` (any iterable, consumed lazily) with batched
+        bulk_create calls inside one transaction.
+        Returns the number of items created.
+        """
+        texts = iter(texts)
+        created = 0
+        with transaction.atomic():
+            while True:
+                batch = [
+                    Item.from_text(text, list=self)
+                    for text in islice(texts, batch_size)
+                ]
+                if not batch:
+                    break
+                Item.objects.bulk_create(batch)
+                created += len(batch)
+            List.objects.filter(id=self.id).update(
+                updated_at=timezone.now(),
+                item_count=models.F('item_count') + created,
+            )
+        return created
+
+    def mark_viewed(self):
+        now = timezone.now()
+        if self.last_viewed_at < now - timedelta(days=1):
+            List.objects.filter(id=self.id).update(last_viewed_at=now)
+            self.last_viewed_at = now
+
+    def archive(self, cutoff=None):
+        """
+        Move the items of the list to a compressed ListArchive row,
+        out of the hot items table. With `cutoff`, only if the list is
+        still neither viewed nor modified since then.
+        Returns the number of items archived.
+        """
+        with transaction.atomic():
+            # a write first, which checks the list again: it takes the
+            # write lock (SQLite: a read first would fail to upgrade with
+            # "database is locked" after a concurrent add_item) or the
+            # row lock, holding off the stamp UPDATE of the write paths
+            # until the items are moved
+            claim = List.objects.filter(id=self.id, archived=False)
+            if cutoff is not None:
+                claim = claim.filter(
+                    updated_at__lt=cutoff, last_viewed_at__lt=cutoff)
+            if not claim.update(archived=True):
+                return 0
+            rows = [
+                [item_id, Item.expand(text, full_text)]
+                for item_id, text, full_text in Item.objects.filter(
+                    list_id=self.id).order_by('id').values_list(
+                        'id', 'text', 'full_text')
+            ]
+            ListArchive.objects.create(
+                list_id=self.id,
+                items=zlib.compress(json.dumps(rows).encode('utf-8')),
+            )
+            # only the items read above: never one that isn't archived
+            item_ids = [item_id for item_id, _ in rows]
+            for start in range(0, len(item_ids), 500):
+                Item.objects.filter(id__in=item_ids[start:start + 500]).delete()
+        self.archived = True
+        return len(rows)
+
+    def restore(self):
+        """Put the archived items back, with their ids."""
+        with transaction.atomic():
+            # a write first: it takes the write lock (SQLite) or the row
+            # lock, so a concurrent restore waits, then finds the list
+            # restored and has nothing to do
+            if List.objects.filter(id=self.id, archived=True).update(
+                    archived=False):
+                archive = ListArchive.objects.filter(list_id=self.id).first()
+                if archive is not None:
+                    rows = json.loads(
+                        zlib.decompress(archive.items).decode('utf-8'))
+                    Item.objects.bulk_create(
+                        [Item(id=item_id, list_id=self.id,
+                              **Item.stored_text(text))
+                         for item_id, text in rows],
+                        batch_size=500,
+                    )
+                    archive.delete()
+        self.archived = False
+
+    def ensure_restored(self):
+        """Restore the items of an archived list before they are read."""
+        if self.archived:
+            self.restore()
+
+
+class ListArchive(models.Model):
+    list = models.OneToOneField(List, primary_key=True)
+    # zlib compressed JSON of the [id, text] of the items
+    items = models.BinaryField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class ItemManager(models.Manager):
+    # the compressed texts are only loaded when asked for
+    def get_queryset(self):
+        return super().get_queryset().defer('full_text')
+
+    def bulk_create(self, objs, batch_size=None):
+        """
+        bulk_create, the whole texts of the long items then going to the
+        search index. SQLite doesn't hand back the ids of a multi rows
+        INSERT: there the long items without an id are saved one by one
+        (Item.save indexes them), in order between the batches.
+        """
+        objs = list(objs)
+        if not any(obj.truncated for obj in objs):
+            return super().bulk_create(objs, batch_size)
+        connection = connections[self.db]
+        with transaction.atomic(using=self.db, savepoint=False):
+            batch, inserted = [], []
+            for obj in objs:
+                if (obj.truncated and obj.pk is None and
+                        not connection.features.can_return_ids_from_bulk_insert):
+                    inserted += super().bulk_create(batch, batch_size)
+                    batch = []
+                    obj.save(force_insert=True, using=self.db)
+                else:
+                    batch.append(obj)
+            inserted += super().bulk_create(batch, batch_size)
+            search.index_full_texts(
+                [(obj.pk, obj.get_full_text())
+                 for obj in inserted if obj.truncated],
+                conn=connection)
+        return objs
 
 
 class Item(models.Model):
+    # the text, or the preview of a long one (see from_text)
     text = models.TextField(default='')
     list = models.ForeignKey(List, default=None)
+    # zlib compressed text of a long item
+    full_text = models.BinaryField(null=True)
+    truncated = models.BooleanField(default=False)
+
+    objects = ItemManager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # items of a list in order, without a sort
+            models.Index(fields=['list', 'id']),
+        ]
+
+    @staticmethod
+    def check_text(text):
+        if len(text) > settings.LISTS_MAX_ITEM_SIZE:
+            raise ItemTooLong(
+                f'Items are limited to {settings.LISTS_MAX_ITEM_SIZE} characters')
+
+    @staticmethod
+    def stored_text(text):
+        """
+        Field values of `text`: past LISTS_ITEM_PREVIEW_SIZE characters
+        only a preview is kept in `text`, so renders of the list stay
+        small, and the whole text is compressed in `full_text`.
+        """
+        size = settings.LISTS_ITEM_PREVIEW_SIZE
+        if len(text) <= size:
+            return {'text': text}
+        return {
+            'text': text[:size] + '\u2026',
+            'full_text': zlib.compress(text.encode('utf-8')),
+            'truncated': True,
+        }
+
+    @classmethod
+    def from_text(cls, text, **fields):
+        """A new item of `text`, refused (ItemTooLong) over the limit."""
+        cls.check_text(text)
+        return cls(**fields, **cls.stored_text(text))
+
+    @staticmethod
+    def expand(text, full_text):
+        """The whole text of an item from its text and full_text values."""
+        if full_text is None:
+            return text
+        return zlib.decompress(full_text).decode('utf-8')
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if self.truncated:
+            # the triggers of the search index only see the preview
+            search.index_full_texts(
+                [(self.pk, self.get_full_text())],
+                conn=connections[self._state.db])
+
+    def get_full_text(self):
+        if not self.truncated:
+            return self.text
+        return self.expand(self.text, self.full_text)
@@ -0,0 +1,172 @@
+"""
+Full-text search over the items.
+
+The index is a table keyed by item id: an FTS5 table (lists_item_fts)
+on SQLite, a tsvector column with a GIN index (lists_item_search) on
+PostgreSQL. Triggers on lists_item keep it in sync with Item.text on
+every write path, bulk_create included. Long items only have a preview
+in Item.text: `index_full_texts` (called by Item.save and
+ItemManager.bulk_create) replaces their entry with the whole text.
+`rebuild_index` (manage.py rebuild_search_index) recreates the index
+from the items table.
+
+The SQL here is the current index, for runtime use: migrations keep
+their own frozen copy. One remaking lists_item on SQLite, which drops
+the triggers, must recreate them from a copy of SQLITE_INDEX.
+"""
+import zlib
+
+from django.db import connection
+
+SEARCH_LIMIT = 50
+
+SQLITE_INDEX = [
+    # keeps its own copy of the texts: a contentless table can't drop a
+    # row without being given its text (before SQLite 3.43)
+    'CREATE VIRTUAL TABLE IF NOT EXISTS lists_item_fts USING fts5(text)',
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_insert
+        AFTER INSERT ON lists_item BEGIN
+        INSERT INTO lists_item_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_delete
+        AFTER DELETE ON lists_item BEGIN
+        DELETE FROM lists_item_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS lists_item_fts_update
+        AFTER UPDATE OF text ON lists_item BEGIN
+        UPDATE lists_item_fts SET text = new.text WHERE rowid = new.id;
+    END""",
+    'DELETE FROM lists_item_fts',
+    'INSERT INTO lists_item_fts(rowid, text) SELECT id, text FROM lists_item',
+]
+SQLITE_DROP_INDEX = [
+    'DROP TRIGGER IF EXISTS lists_item_fts_insert',
+    'DROP TRIGGER IF EXISTS lists_item_fts_delete',
+    'DROP TRIGGER IF EXISTS lists_item_fts_update',
+    'DROP TABLE IF EXISTS lists_item_fts',
+]
+POSTGRES_INDEX = [
+    """CREATE TABLE IF NOT EXISTS lists_item_search (
+        item_id integer PRIMARY KEY, document tsvector NOT NULL)""",
+    """CREATE INDEX IF NOT EXISTS lists_item_search_document
+        ON lists_item_search USING GIN (document)""",
+    """CREATE OR REPLACE FUNCTION lists_item_search_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM lists_item_search WHERE item_id = old.id;
+        ELSE
+            INSERT INTO lists_item_search
+                VALUES (new.id, to_tsvector('simple', new.text))
+                ON CONFLICT (item_id) DO UPDATE SET document = excluded.document;
+        END IF;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql""",
+    'DROP TRIGGER IF EXISTS lists_item_search_sync ON lists_item',
+    """CREATE TRIGGER lists_item_search_sync
+        AFTER INSERT OR DELETE OR UPDATE OF text ON lists_item
+        FOR EACH ROW EXECUTE PROCEDURE lists_item_search_sync()""",
+    'DELETE FROM lists_item_search',
+    """INSERT INTO lists_item_search
+        SELECT id, to_tsvector('simple', text) FROM lists_item""",
+]
+POSTGRES_DROP_INDEX = [
+    'DROP TRIGGER IF EXISTS lists_item_search_sync ON lists_item',
+    'DROP FUNCTION IF EXISTS lists_item_search_sync()',
+    'DROP TABLE IF EXISTS lists_item_search',
+]
+INDEX_FULL_TEXT = {
+    'sqlite': 'UPDATE lists_item_fts SET text = %s WHERE rowid = %s',
+    'postgresql': """UPDATE lists_item_search
+        SET document = to_tsvector('simple', %s) WHERE item_id = %s""",
+}
+
+
+class SearchUnavailable(Exception):
+    pass
+
+
+def _statements(vendor, drop=False):
+    if vendor == 'sqlite':
+        return SQLITE_DROP_INDEX if drop else SQLITE_INDEX
+    if vendor == 'postgresql':
+        return POSTGRES_DROP_INDEX if drop else POSTGRES_INDEX
+    return []
+
+def index_full_texts(rows, conn=connection):
+    """
+    Index the whole text of long items, from (id, text) rows: the
+    triggers only saw their previews.
+    """
+    sql = INDEX_FULL_TEXT.get(conn.vendor)
+    rows = [(text, item_id) for item_id, text in rows]
+    if sql and rows:
+        with conn.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+def _index_long_items(conn, batch_size=500):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            'SELECT id, full_text FROM lists_item WHERE truncated ORDER BY id')
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            index_full_texts(
+                [(item_id, zlib.decompress(full_text).decode('utf-8'))
+                 for item_id, full_text in batch],
+                conn=conn)
+
+def install_index(schema_editor):
+    """Create the index and its triggers, and fill it."""
+    for statement in _statements(schema_editor.connection.vendor):
+        schema_editor.execute(statement)
+    _index_long_items(schema_editor.connection)
+
+def drop_index(schema_editor):
+    for statement in _statements(schema_editor.connection.vendor, drop=True):
+        schema_editor.execute(statement)
+
+def rebuild_index():
+    with connection.schema_editor() as schema_editor:
+        drop_index(schema_editor)
+        install_index(schema_editor)
+
+def _fts5_query(query):
+    # every word quoted: user input never reaches the FTS5 query syntax
+    return ' '.join(
+        '"{}"'.format(word.replace('"', '""')) for word in query.split())
+
+def search_items(query, list_id=None, limit=SEARCH_LIMIT):
+    """
+    Items matching all the words of `query`, best matches first, as
+    (id, list_id, text) rows.
+    """
+    if not query.split():
+        return []
+    scope, scope_params = ('AND item.list_id = %s', [list_id]) \
+        if list_id is not None else ('', [])
+    if connection.vendor == 'sqlite':
+        sql = f"""
+            SELECT item.id, item.list_id, item.text
+            FROM lists_item_fts
+            JOIN lists_item item ON item.id = lists_item_fts.rowid
+            WHERE lists_item_fts MATCH %s {scope}
+            ORDER BY lists_item_fts.rank LIMIT %s
+        """
+        params = [_fts5_query(query), *scope_params, limit]
+    elif connection.vendor == 'postgresql':
+        sql = f"""
+            SELECT item.id, item.list_id, item.text
+            FROM lists_item_search search
+            JOIN lists_item item ON item.id = search.item_id,
+            plainto_tsquery('simple', %s) query
+            WHERE search.document @@ query {scope}
+            ORDER BY ts_rank(search.document, query) DESC
+            LIMIT %s
+        """
+        params = [query, *scope_params, limit]
+    else:
+        raise SearchUnavailable(f'No full-text search on {connection.vendor}')
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
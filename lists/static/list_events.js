@@ -0,0 +1,27 @@
+// Appends the items added by others to the list table, from the
+// Server-Sent Events of /lists/<id>/events (see lists.events).
+(function () {
+    var table = document.getElementById('id_list_table');
+    if (!table || !table.dataset.events || !window.EventSource) {
+        return;
+    }
+    var row = parseInt(table.dataset.nextRow, 10);
+    var source = new EventSource(table.dataset.events);
+    source.addEventListener('item', function (event) {
+        var item = JSON.parse(event.data);
+        var tr = document.createElement('tr');
+        var td = document.createElement('td');
+        td.textContent = row + ': ' + item.text;
+        row += 1;
+        if (item.truncated) {
+            var more = document.createElement('a');
+            more.href = table.dataset.events.replace(
+                /events\?.*$/, 'items/' + item.id);
+            more.textContent = 'more';
+            td.appendChild(document.createTextNode(' '));
+            td.appendChild(more);
+        }
+        tr.appendChild(td);
+        table.appendChild(tr);
+    });
+})();
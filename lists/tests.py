@@ -1,9 +1,28 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, migrations, models
 from django.urls import resolve
-from django.test import TestCase
-from lists.views import home_page
+from django.utils import timezone
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from lists.views import _iter_items, home_page
 from django.http import HttpRequest
 
-from lists.models import Item, List
+from lists.cache import LRULocMemCache
+from lists.events import Broker
+from lists.management.commands.benchmark import percentile, summarize
+from lists.management.commands.check_migrations import breaking_change
+from lists.models import Item, List, ListArchive
+from lists.writebehind import ItemWriter, _Pending, item_writer
+from superlists.db import apply_sqlite_pragmas, check_persistent_connections
 
 class HomePageTest(TestCase):
 
@@ -16,6 +35,20 @@ class HomePageTest(TestCase):
         self.client.get('/')
         self.assertEqual(Item.objects.count(), 0)
 
+    @override_settings(LISTS_STATIC_HOME=True)
+    def test_static_home_page_has_a_working_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.get('/')
+        self.assertNotContains(response, 'csrf-token-placeholder')
+        token = re.search(
+            r"name='csrfmiddlewaretoken' value='([^']+)'",
+            response.content.decode()).group(1)
+        response = client.post('/lists/new', data={
+            'item_text': 'A new list item',
+            'csrfmiddlewaretoken': token,
+        })
+        self.assertEqual(response.status_code, 302)
+
 
 class NewListViewTest(TestCase):
     def test_can_save_a_POST_request(self):
@@ -65,8 +98,193 @@ class NewItemViewTest(TestCase):
 
         self.assertRedirects(response, f'/lists/{list_.id}/')
 
+    def test_returns_404_for_a_missing_list(self):
+        response = self.client.post('/lists/999/add_item',
+        data = {
+            "item_text": "A new list item"
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Item.objects.count(), 0)
+
+
+class WritePathQueryCountTest(TestCase):
+
+    def test_new_list_query_count(self):
+        # list INSERT + item INSERT, inside one transaction (savepoint)
+        with self.assertNumQueries(4):
+            self.client.post('/lists/new', data={'item_text': 'item'})
+
+    def test_add_item_query_count(self):
+        # list stamp UPDATE (existence check) + item INSERT,
+        # inside one transaction (savepoint), then the item count for
+        # the redirect to the last page (one page: no cursor query)
+        list_ = List.objects.create()
+        with self.assertNumQueries(5):
+            self.client.post(f'/lists/{list_.id}/add_item',
+                data={'item_text': 'item'})
+
+
+class ItemCountTest(TestCase):
+
+    def test_new_list_counts_its_first_item(self):
+        self.client.post('/lists/new', data={'item_text': 'item'})
+        self.assertEqual(List.objects.get().item_count, 1)
+
+    def test_add_item_increments_the_count(self):
+        list_ = List.objects.create(item_count=1)
+        self.client.post(f'/lists/{list_.id}/add_item',
+            data={'item_text': 'item'})
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, 2)
+
+    def test_bulk_add_counts_all_items(self):
+        list_ = List.objects.create()
+        list_.add_items(['a', 'b', 'c'], batch_size=2)
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, 3)
+
+    def test_items_are_ordered_by_id(self):
+        list_ = List.objects.create()
+        second = Item.objects.create(id=2, text='second', list=list_)
+        first = Item.objects.create(id=1, text='first', list=list_)
+        self.assertEqual(list(list_.item_set.all()), [first, second])
+
+
+@override_settings(LISTS_WRITE_COALESCING=True)
+class CoalescedAddItemTest(TransactionTestCase):
+
+    def tearDown(self):
+        # its connection would keep the test database from being dropped
+        item_writer.stop()
+
+    def test_item_is_visible_after_the_redirect(self):
+        list_ = List.objects.create()
+        response = self.client.post(f'/lists/{list_.id}/add_item',
+            data={'item_text': 'A new list item'}, follow=True)
+        self.assertContains(response, '1: A new list item')
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, 1)
+
+    def test_missing_list_is_a_404(self):
+        response = self.client.post('/lists/999/add_item',
+            data={'item_text': 'A new list item'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_commit_timeout_is_a_503(self):
+        list_ = List.objects.create()
+        with mock.patch('lists.views.item_writer.add', side_effect=TimeoutError):
+            response = self.client.post(f'/lists/{list_.id}/add_item',
+                data={'item_text': 'A new list item'})
+        self.assertEqual(response.status_code, 503)
+
+    def test_batch_commits_items_of_several_lists_at_once(self):
+        list_1, list_2 = List.objects.create(), List.objects.create()
+        batch = [_Pending(list_1.id, 'a'), _Pending(list_2.id, 'b'),
+                 _Pending(list_1.id, 'c'), _Pending(999, 'd')]
+        ItemWriter().commit(batch)
+        self.assertTrue(all(pending.done.is_set() for pending in batch))
+        self.assertIsInstance(batch[3].error, List.DoesNotExist)
+        self.assertEqual(
+            [item.text for item in Item.objects.filter(list=list_1)], ['a', 'c'])
+        list_1.refresh_from_db()
+        self.assertEqual(list_1.item_count, 2)
+
+
+    def test_post_commit_error_is_logged_and_the_item_acknowledged(self):
+        list_ = List.objects.create()
+        batch = [_Pending(list_.id, 'a')]
+        with mock.patch('lists.events.publish', side_effect=RuntimeError), \
+                self.assertLogs('lists.writebehind', 'ERROR'):
+            ItemWriter().commit(batch)
+        self.assertTrue(batch[0].done.is_set())
+        self.assertIsNone(batch[0].error)
+        self.assertEqual(Item.objects.filter(list=list_).count(), 1)
+
+    def test_dead_thread_is_restarted(self):
+        list_ = List.objects.create()
+        writer = ItemWriter()
+        with mock.patch.object(writer, '_next_batch', side_effect=SystemExit):
+            writer._ensure_started()
+            writer._thread.join()
+        writer.add(list_.id, 'a')
+        writer.stop()
+        self.assertEqual(Item.objects.filter(list=list_).count(), 1)
+
+
+class BulkAddItemsTest(TestCase):
+
+    def test_adds_one_item_per_line(self):
+        list_ = List.objects.create()
+        response = self.client.post(f'/lists/{list_.id}/add_items',
+            data='first\n\nsecond\n', content_type='text/plain')
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(
+            [item.text for item in list_.item_set.order_by('id')],
+            ['first', 'second'])
+
+    def test_adds_items_from_a_json_array(self):
+        list_ = List.objects.create()
+        response = self.client.post(f'/lists/{list_.id}/add_items',
+            data=json.dumps(['first', 'second']),
+            content_type='application/json')
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(Item.objects.filter(list=list_).count(), 2)
+
+    def test_rejects_json_that_is_not_an_array_of_strings(self):
+        list_ = List.objects.create()
+        response = self.client.post(f'/lists/{list_.id}/add_items',
+            data=json.dumps({'text': 'first'}),
+            content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_rejects_text_that_is_not_utf8(self):
+        list_ = List.objects.create()
+        response = self.client.post(f'/lists/{list_.id}/add_items',
+            data=b'caf\xe9\n', content_type='text/plain')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_import_items_command_streams_a_file(self):
+        list_ = List.objects.create()
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write('first\nsecond\nthird\n')
+            f.flush()
+            out = StringIO()
+            call_command('import_items', list_.id, f.name,
+                batch_size=2, stdout=out)
+        self.assertEqual(Item.objects.filter(list=list_).count(), 3)
+        self.assertIn('Imported 3 items', out.getvalue())
+
+
+    def import_items(self, list_, content, **options):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write(content)
+            f.flush()
+            call_command('import_items', list_.id, f.name, stdout=StringIO(),
+                **options)
+
+    def test_import_items_command_rejects_malformed_json(self):
+        list_ = List.objects.create()
+        with self.assertRaisesRegex(CommandError, 'Invalid JSON'):
+            self.import_items(list_, '["first", ', json=True)
+        with self.assertRaisesRegex(CommandError, 'Expected a JSON array'):
+            self.import_items(list_, '{"text": "first"}', json=True)
+        with self.assertRaisesRegex(CommandError, '^Item 1: expected a string'):
+            self.import_items(list_, '["first", 2]', json=True)
+        self.assertEqual(Item.objects.count(), 0)
+
+    @override_settings(LISTS_MAX_ITEM_SIZE=10)
+    def test_import_items_command_names_the_line_too_long(self):
+        list_ = List.objects.create()
+        with self.assertRaisesRegex(CommandError, '^Line 3: '):
+            self.import_items(list_, 'first\n\n' + 'x' * 11 + '\n', batch_size=1)
+        self.assertEqual(Item.objects.count(), 0)
 
 class ListViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_uses_list_template(self):
         list_ = List.objects.create()
         response = self.client.get(f'/lists/{list_.id}/')
@@ -101,6 +319,529 @@ class ListViewTest(TestCase):
         self.assertEqual(response.context['list_'], list_2)
 
 
+@override_settings(LISTS_PAGE_SIZE=2)
+class ListPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_ = List.objects.create()
+        self.items = [
+            Item.objects.create(text=f'item {n}', list=self.list_)
+            for n in range(1, 6)
+        ]
+
+    def test_first_page_only_renders_page_size_items(self):
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertEqual(response.context['items'], self.items[:2])
+        self.assertContains(response, '1: item 1')
+        self.assertNotContains(response, 'item 3')
+        self.assertEqual(response.context['next_cursor'], self.items[1].id)
+        self.assertIsNone(response.context['prev_cursor'])
+
+    def test_next_cursor_continues_after_last_item(self):
+        response = self.client.get(
+            f'/lists/{self.list_.id}/?after={self.items[1].id}&start=3')
+        self.assertEqual(response.context['items'], self.items[2:4])
+        self.assertContains(response, '3: item 3')
+        self.assertEqual(response.context['prev_cursor'], self.items[2].id)
+
+    def test_prev_cursor_goes_back_before_first_item(self):
+        response = self.client.get(
+            f'/lists/{self.list_.id}/?before={self.items[4].id}&start=3')
+        self.assertEqual(response.context['items'], self.items[2:4])
+        self.assertEqual(response.context['prev_start'], 1)
+        self.assertEqual(response.context['next_cursor'], self.items[3].id)
+
+    def test_add_item_redirects_to_the_page_of_the_new_item(self):
+        list_ = List.objects.create()
+        list_.add_items(['item 1', 'item 2', 'item 3', 'item 4'])
+        response = self.client.post(f'/lists/{list_.id}/add_item',
+            data={'item_text': 'item 5'}, follow=True)
+        self.assertContains(response, '5: item 5')
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertContains(response, 'data-events=')
+
+    def test_last_page_has_no_next_cursor(self):
+        response = self.client.get(
+            f'/lists/{self.list_.id}/?after={self.items[3].id}&start=5')
+        self.assertEqual(response.context['items'], self.items[4:])
+        self.assertIsNone(response.context['next_cursor'])
+
+
+class ListTableCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_ = List.objects.create()
+        Item.objects.create(text='item_1', list=self.list_)
+
+    def test_second_view_skips_the_items_query(self):
+        self.client.get(f'/lists/{self.list_.id}/')
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(response, '1: item_1')
+
+    def test_add_item_invalidates_the_cached_table(self):
+        self.client.get(f'/lists/{self.list_.id}/')
+        self.client.post(f'/lists/{self.list_.id}/add_item',
+            data={'item_text': 'item_2'})
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(response, '2: item_2')
+
+    def test_write_from_another_process_invalidates_the_cached_table(self):
+        self.client.get(f'/lists/{self.list_.id}/')
+        # another worker: its local cache never got the new version
+        Item.objects.create(text='item_2', list=self.list_)
+        self.list_.save(update_fields=['updated_at'])
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(response, '2: item_2')
+
+    def test_lru_cache_evicts_least_recently_used(self):
+        lru = LRULocMemCache('test-lru', {
+            'OPTIONS': {'MAX_ENTRIES': 2, 'CULL_FREQUENCY': 2}})
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('c'), 3)
+
+
+class ListEventsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_ = List.objects.create()
+        self.first = Item.objects.create(text='item_1', list=self.list_)
+
+    def events(self, **kwargs):
+        response = self.client.get(f'/lists/{self.list_.id}/events', **kwargs)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return b''.join(response.streaming_content).decode()
+
+    def test_streams_the_items_after_the_given_one(self):
+        second = Item.objects.create(text='item_2', list=self.list_)
+        Item.objects.create(text='other', list=List.objects.create())
+        body = self.events(data={'after': self.first.id})
+        self.assertIn(f'id: {second.id}\nevent: item\n', body)
+        self.assertIn('"text": "item_2"', body)
+        self.assertNotIn('item_1', body)
+        self.assertNotIn('other', body)
+
+    def test_last_event_id_of_a_reconnection_wins(self):
+        second = Item.objects.create(text='item_2', list=self.list_)
+        body = self.events(data={'after': 0}, HTTP_LAST_EVENT_ID=str(second.id))
+        self.assertNotIn('event: item', body)
+
+    def test_without_cursor_only_new_items_are_sent(self):
+        self.assertNotIn('event: item', self.events())
+
+    def test_tells_the_browser_when_to_reconnect(self):
+        with override_settings(LISTS_EVENTS_POLL=3):
+            self.assertTrue(self.events().startswith('retry: 3000\n\n'))
+
+    def test_404_for_a_missing_list(self):
+        response = self.client.get(f'/lists/{self.list_.id + 1}/events')
+        self.assertEqual(response.status_code, 404)
+
+    def test_last_page_subscribes_to_the_events(self):
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(
+            response, f'data-events="/lists/{self.list_.id}/events?after={self.first.id}"')
+        self.assertContains(response, 'data-next-row="2"')
+
+    @override_settings(LISTS_PAGE_SIZE=1)
+    def test_earlier_pages_dont_subscribe(self):
+        Item.objects.create(text='item_2', list=self.list_)
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertNotContains(response, 'data-events')
+
+    def test_add_item_wakes_the_waiting_streams(self):
+        with mock.patch('lists.events.broker') as broker:
+            self.client.post(f'/lists/{self.list_.id}/add_item',
+                data={'item_text': 'item_2'})
+        broker.publish.assert_called_once_with(self.list_.id)
+
+    def test_broker_wait_returns_on_publish_or_timeout(self):
+        broker = Broker()
+        version = broker.version(1)
+        self.assertFalse(broker.wait(1, version, timeout=0.01))
+        broker.publish(1)
+        self.assertTrue(broker.wait(1, version, timeout=0.01))
+        self.assertFalse(broker.wait(2, broker.version(2), timeout=0.01))
+
+
+class ListConditionalGetTest(TestCase):
+    def setUp(self):
+        self.list_ = List.objects.create()
+        Item.objects.create(text='item_1', list=self.list_)
+
+    def test_sends_etag_and_last_modified(self):
+        self.client.get(f'/lists/{self.list_.id}/')
+        # once the browser has its CSRF cookie
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_matching_etag_gets_a_304_without_items_query(self):
+        etag = self.client.get(f'/lists/{self.list_.id}/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f'/lists/{self.list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_revalidated_page_without_csrf_cookie_posts_a_valid_token(self):
+        client = Client(enforce_csrf_checks=True)
+        page = client.get(f'/lists/{self.list_.id}/')
+        client.cookies.clear()
+        response = client.get(
+            f'/lists/{self.list_.id}/', HTTP_IF_NONE_MATCH=page['ETag'])
+        if response.status_code != 304:
+            # the browser shows the new page, not its cached copy
+            page = response
+        token = re.search(
+            r"name='csrfmiddlewaretoken' value='([^']+)'",
+            page.content.decode()).group(1)
+        response = client.post(f'/lists/{self.list_.id}/add_item', data={
+            'item_text': 'item_2', 'csrfmiddlewaretoken': token})
+        self.assertEqual(response.status_code, 302)
+
+    def test_missing_list_is_a_404(self):
+        response = self.client.get('/lists/999/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_add_item_changes_the_etag(self):
+        etag = self.client.get(f'/lists/{self.list_.id}/')['ETag']
+        self.client.post(f'/lists/{self.list_.id}/add_item',
+            data={'item_text': 'item_2'})
+        response = self.client.get(
+            f'/lists/{self.list_.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '2: item_2')
+
+
+@override_settings(LISTS_MAX_ITEM_SIZE=1000, LISTS_ITEM_PREVIEW_SIZE=10,
+                   LISTS_MAX_FORM_SIZE=2000)
+class ItemSizeLimitTest(TestCase):
+    long_text = 'peacock feathers ' * 20
+
+    def setUp(self):
+        cache.clear()
+        self.list_ = List.objects.create()
+
+    def test_oversized_form_is_refused_before_reading_the_body(self):
+        with mock.patch('django.http.request.HttpRequest.read') as read:
+            response = self.client.post(
+                f'/lists/{self.list_.id}/add_item', data={'item_text': 'x' * 3000})
+        self.assertEqual(response.status_code, 413)
+        read.assert_not_called()
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_bulk_endpoints_keep_the_request_limit(self):
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=100):
+            response = self.client.post(
+                f'/lists/{self.list_.id}/add_items', 'item\n' * 50,
+                content_type='text/plain')
+        self.assertEqual(response.status_code, 413)
+
+    def test_items_over_the_limit_are_refused(self):
+        response = self.client.post(
+            f'/lists/{self.list_.id}/add_item', data={'item_text': 'x' * 1001})
+        self.assertEqual(response.status_code, 413)
+        response = self.client.post(
+            f'/api/lists/{self.list_.id}/items', json.dumps({'text': 'x' * 1001}),
+            content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_long_items_keep_a_preview_and_the_compressed_text(self):
+        self.client.post(
+            f'/lists/{self.list_.id}/add_item', data={'item_text': self.long_text})
+        item = Item.objects.get()
+        self.assertTrue(item.truncated)
+        self.assertEqual(item.text, 'peacock fe\u2026')
+        # loaded on demand only
+        self.assertIn('full_text', item.get_deferred_fields())
+        self.assertEqual(item.get_full_text(), self.long_text)
+
+    def test_list_page_renders_the_preview_only(self):
+        item = Item.from_text(self.long_text, list=self.list_)
+        item.save()
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(response, 'peacock fe\u2026')
+        self.assertNotContains(response, self.long_text)
+        self.assertContains(
+            response, f'href="/lists/{self.list_.id}/items/{item.id}">more</a>')
+
+    def test_whole_text_is_fetched_apart(self):
+        item = Item.from_text(self.long_text, list=self.list_)
+        item.save()
+        response = self.client.get(f'/lists/{self.list_.id}/items/{item.id}')
+        self.assertEqual(response.content.decode(), self.long_text)
+
+    def test_exports_and_archives_keep_the_whole_text(self):
+        self.list_.add_items([self.long_text, 'short'])
+        self.assertEqual(
+            [text for _, text in _iter_items(self.list_.id)],
+            [self.long_text, 'short'])
+        self.list_.archive()
+        self.list_.restore()
+        self.assertEqual(
+            [item.get_full_text() for item in Item.objects.all()],
+            [self.long_text, 'short'])
+
+
+class ExportListTest(TestCase):
+    def setUp(self):
+        self.list_ = List.objects.create()
+        self.items = [
+            Item.objects.create(text='item_1', list=self.list_),
+            Item.objects.create(text='item, "2"', list=self.list_),
+        ]
+        other_list = List.objects.create()
+        Item.objects.create(text='other item', list=other_list)
+
+    def export(self, fmt):
+        response = self.client.get(f'/lists/{self.list_.id}/export.{fmt}')
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_exports_csv(self):
+        self.assertEqual(self.export('csv'),
+            'id,text\r\n'
+            f'{self.items[0].id},item_1\r\n'
+            f'{self.items[1].id},"item, ""2"""\r\n')
+
+    def test_exports_json(self):
+        self.assertEqual(json.loads(self.export('json')), [
+            {'id': self.items[0].id, 'text': 'item_1'},
+            {'id': self.items[1].id, 'text': 'item, "2"'},
+        ])
+
+    def test_exports_text(self):
+        self.assertEqual(self.export('txt'), 'item_1\nitem, "2"\n')
+
+    def test_exports_empty_list(self):
+        list_ = List.objects.create()
+        response = self.client.get(f'/lists/{list_.id}/export.json')
+        self.assertEqual(b''.join(response.streaming_content), b'[]\n')
+
+    def test_reads_items_by_chunks(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(len(list(_iter_items(self.list_.id, chunk_size=2))), 2)
+
+    def test_missing_list_is_a_404(self):
+        response = self.client.get('/lists/999/export.csv')
+        self.assertEqual(response.status_code, 404)
+
+
+class ListApiTest(TestCase):
+
+    def post_json(self, path, data):
+        return self.client.post(
+            path, data=json.dumps(data), content_type='application/json')
+
+    def test_create_list_returns_the_ids(self):
+        response = self.post_json('/api/lists', {'items': ['a', 'b']})
+        self.assertEqual(response.status_code, 201)
+        list_ = List.objects.get()
+        self.assertEqual(response.json(), {
+            'id': list_.id,
+            'item_ids': list(list_.item_set.values_list('id', flat=True)),
+        })
+        self.assertEqual(list_.item_count, 2)
+
+    def test_add_one_or_many_items(self):
+        list_ = List.objects.create()
+        response = self.post_json(f'/api/lists/{list_.id}/items', {'text': 'a'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['item_ids']), 1)
+        response = self.post_json(
+            f'/api/lists/{list_.id}/items', {'items': ['b', 'c']})
+        self.assertEqual(len(response.json()['item_ids']), 2)
+        list_.refresh_from_db()
+        self.assertEqual(list_.item_count, 3)
+
+    def test_add_items_with_invalid_body(self):
+        list_ = List.objects.create()
+        response = self.post_json(f'/api/lists/{list_.id}/items', {'items': [1]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def test_add_items_to_a_missing_list(self):
+        response = self.post_json('/api/lists/999/items', {'text': 'a'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Item.objects.count(), 0)
+
+    def test_items_are_paged_with_a_cursor(self):
+        list_ = List.objects.create()
+        items = [Item.objects.create(text=f'item {n}', list=list_)
+                 for n in range(3)]
+        page = self.client.get(f'/api/lists/{list_.id}/items?limit=2').json()
+        self.assertEqual(page['items'], [
+            {'id': items[0].id, 'text': 'item 0'},
+            {'id': items[1].id, 'text': 'item 1'},
+        ])
+        self.assertEqual(page['next'], items[1].id)
+        page = self.client.get(
+            f'/api/lists/{list_.id}/items?limit=2&after={page["next"]}').json()
+        self.assertEqual(page['items'], [{'id': items[2].id, 'text': 'item 2'}])
+        self.assertIsNone(page['next'])
+
+    def test_list_detail(self):
+        list_ = List.objects.create(item_count=4)
+        response = self.client.get(f'/api/lists/{list_.id}')
+        self.assertEqual(response.json()['item_count'], 4)
+        self.assertEqual(self.client.get('/api/lists/999').status_code, 404)
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.list_ = List.objects.create()
+        self.other_list = List.objects.create()
+        self.milk = Item.objects.create(text='Buy milk', list=self.list_)
+        Item.objects.create(text='Buy peacock feathers', list=self.list_)
+        self.other_milk = Item.objects.create(
+            text='milk the goat', list=self.other_list)
+
+    def search(self, query, **params):
+        response = self.client.get('/api/search', dict(q=query, **params))
+        return sorted(item['id'] for item in response.json()['items'])
+
+    def test_search_all_lists(self):
+        self.assertEqual(self.search('milk'), [self.milk.id, self.other_milk.id])
+
+    def test_search_one_list(self):
+        self.assertEqual(self.search('milk', list=self.list_.id), [self.milk.id])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.search('buy milk'), [self.milk.id])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('milk" OR "feathers'), [])
+        self.assertEqual(self.search('NEAR('), [])
+
+    def test_index_follows_bulk_creates_and_deletes(self):
+        self.list_.add_items(['Buy bread'])
+        self.assertEqual(len(self.search('bread')), 1)
+        Item.objects.filter(text='Buy bread').delete()
+        self.assertEqual(self.search('bread'), [])
+
+    def test_rebuild_command(self):
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('milk'), [self.milk.id, self.other_milk.id])
+
+    @override_settings(LISTS_ITEM_PREVIEW_SIZE=10)
+    def test_long_items_match_on_their_whole_text(self):
+        self.list_.add_items(['a', 'Buy feathers for the zebra', 'b'])
+        Item.from_text('Walk the zebra twice', list=self.other_list).save()
+        self.assertEqual(len(self.search('zebra')), 2)
+        self.list_.archive()
+        self.list_.restore()
+        self.assertEqual(len(self.search('zebra')), 2)
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search('zebra')), 2)
+        Item.objects.filter(truncated=True).delete()
+        self.assertEqual(self.search('zebra'), [])
+
+
+class ArchiveListsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.list_ = List.objects.create()
+        self.items = [
+            Item.objects.create(text='item_1', list=self.list_),
+            Item.objects.create(text='item_2', list=self.list_),
+        ]
+        long_ago = timezone.now() - timedelta(days=100)
+        List.objects.filter(id=self.list_.id).update(
+            item_count=2, updated_at=long_ago, last_viewed_at=long_ago)
+
+    def archive(self, days=90):
+        out = StringIO()
+        call_command('archive_lists', days=days, no_vacuum=True, stdout=out)
+        return out.getvalue()
+
+    def test_moves_cold_lists_to_the_archive(self):
+        self.assertIn('Archived 2 items of 1 lists', self.archive())
+        self.assertEqual(Item.objects.count(), 0)
+        self.assertTrue(List.objects.get().archived)
+        self.assertEqual(ListArchive.objects.count(), 1)
+
+    def test_keeps_recently_viewed_lists(self):
+        self.client.get(f'/lists/{self.list_.id}/')
+        self.assertIn('Archived 0 items of 0 lists', self.archive())
+
+    def test_view_list_restores_the_items(self):
+        self.archive()
+        response = self.client.get(f'/lists/{self.list_.id}/')
+        self.assertContains(response, '2: item_2')
+        self.assertEqual(list(Item.objects.all()), self.items)
+        self.assertFalse(List.objects.get().archived)
+        self.assertEqual(ListArchive.objects.count(), 0)
+
+    def test_export_restores_the_items(self):
+        self.archive()
+        response = self.client.get(f'/lists/{self.list_.id}/export.txt')
+        self.assertEqual(b''.join(response.streaming_content), b'item_1\nitem_2\n')
+
+    def test_list_touched_since_it_was_picked_is_kept(self):
+        cutoff = timezone.now() - timedelta(days=90)
+        List.objects.filter(id=self.list_.id).update(updated_at=timezone.now())
+        self.assertEqual(self.list_.archive(cutoff), 0)
+        self.assertEqual(Item.objects.count(), 2)
+        self.assertFalse(List.objects.get().archived)
+
+    def test_locked_list_is_reported_and_the_others_archived(self):
+        other = List.objects.create()
+        Item.objects.create(text='item_3', list=other)
+        long_ago = timezone.now() - timedelta(days=100)
+        List.objects.filter(id=other.id).update(
+            item_count=1, updated_at=long_ago, last_viewed_at=long_ago)
+        archive = List.archive
+        def locked_first(list_, cutoff):
+            if list_.id == self.list_.id:
+                raise OperationalError('database is locked')
+            return archive(list_, cutoff)
+        err = StringIO()
+        with mock.patch.object(List, 'archive', locked_first):
+            call_command('archive_lists', no_vacuum=True, stdout=StringIO(),
+                         stderr=err)
+        self.assertIn(f'List {self.list_.id} not archived', err.getvalue())
+        self.assertEqual(Item.objects.count(), 2)
+        self.assertTrue(List.objects.get(id=other.id).archived)
+
+    def test_second_restore_of_a_list_does_nothing(self):
+        self.archive()
+        first, second = List.objects.get(), List.objects.get()
+        first.restore()
+        second.restore()
+        self.assertEqual(list(Item.objects.all()), self.items)
+
+    def test_api_restores_the_items_before_paging(self):
+        self.archive()
+        self.client.post(
+            f'/api/lists/{self.list_.id}/items', data=json.dumps({'text': 'item_3'}),
+            content_type='application/json')
+        response = self.client.get(f'/api/lists/{self.list_.id}/items')
+        self.assertEqual(
+            [item['text'] for item in response.json()['items']],
+            ['item_1', 'item_2', 'item_3'])
+
+
+class CheckMigrationsTest(TestCase):
+
+    def test_passes_when_the_schema_is_up_to_date(self):
+        out = StringIO()
+        call_command('check_migrations', stdout=out)
+        self.assertIn('0 migrations to apply', out.getvalue())
+
+    def test_not_null_column_breaks_the_running_release(self):
+        self.assertIn('NOT NULL', breaking_change(migrations.AddField(
+            'item', 'done', models.BooleanField(default=False))))
+        self.assertIsNone(breaking_change(migrations.AddField(
+            'item', 'done', models.NullBooleanField())))
+        self.assertIsNotNone(breaking_change(migrations.RemoveField('item', 'done')))
+
+
 class ListAndItemModelTest(TestCase):    
 
     def test_saving_and_retrieving_items(self):
@@ -134,3 +875,96 @@ class ListAndItemModelTest(TestCase):
         self.assertEqual(second_saved_item.list, saved_list)
 
 
+@skipUnless(connection.vendor == 'sqlite', 'SQLite pragmas')
+class SQLitePragmasTest(TestCase):
+
+    @override_settings(SQLITE_PRAGMAS={'cache_size': -4000})
+    def test_pragmas_are_applied_to_the_connection(self):
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -4000)
+
+
+class PersistentConnectionsTest(TestCase):
+
+    def make_connection(self, usable):
+        conn = mock.Mock(settings_dict={'CONN_MAX_AGE': 600})
+        conn.is_usable.return_value = usable
+        return conn
+
+    @override_settings(DB_HEALTH_CHECKS=True)
+    def test_closes_unusable_persistent_connections(self):
+        broken, healthy = self.make_connection(False), self.make_connection(True)
+        with mock.patch('superlists.db.connections') as connections:
+            connections.all.return_value = [broken, healthy]
+            check_persistent_connections()
+        broken.close.assert_called_once_with()
+        healthy.close.assert_not_called()
+
+
+class BenchmarkSummaryTest(TestCase):
+
+    def test_percentiles_use_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summary_reports_rate_latencies_and_queries(self):
+        summary = summarize([0.001, 0.002, 0.003, 0.004], 0.5, [2, 2, 3, 3])
+        self.assertEqual(summary['requests_per_second'], 8.0)
+        self.assertEqual(summary['p50_ms'], 2.0)
+        self.assertEqual(summary['p99_ms'], 4.0)
+        self.assertEqual(summary['queries_per_request'], 2.5)
+
+    def test_summary_reports_response_sizes(self):
+        summary = summarize([0.001, 0.002], 0.5, sizes=[100, 301], cache_hits=1)
+        self.assertEqual(summary['bytes_per_response'], 200)
+        self.assertEqual(summary['cache_hits'], 1)
+        self.assertIsNone(summarize([0.001], 0.5)['bytes_per_response'])
+
+
+class TimingMiddlewareTest(TestCase):
+
+    def test_sends_server_timing_with_query_count(self):
+        list_ = List.objects.create()
+        cache.clear()
+        response = self.client.get(f'/lists/{list_.id}/')
+        timing = response['Server-Timing']
+        self.assertIn('total;dur=', timing)
+        self.assertIn('tpl;dur=', timing)
+        self.assertIn('desc="2 queries"', timing)
+
+    @override_settings(METRICS_ENDPOINT=True)
+    def test_metrics_endpoint_serves_counters(self):
+        self.client.get('/')
+        response = self.client.get('/metrics')
+        self.assertContains(response, 'superlists_requests_total{view="home_page"}')
+
+    def test_metrics_endpoint_is_off_by_default(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_ENDPOINT=True, METRICS_ALLOWED_IPS=[])
+    def test_metrics_endpoint_only_answers_allowed_ips(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 404)
+
+
+class CompressedStaticFilesTest(TestCase):
+
+    def test_collectstatic_writes_hashed_and_gzipped_files(self):
+        with tempfile.TemporaryDirectory() as static_root:
+            with override_settings(
+                    STATIC_ROOT=static_root,
+                    STATICFILES_STORAGE=
+                        'superlists.storage.CompressedManifestStaticFilesStorage'):
+                call_command('collectstatic', interactive=False, verbosity=0)
+                with open(os.path.join(static_root, 'staticfiles.json')) as f:
+                    hashed = json.load(f)['paths']['base.css']
+            path = os.path.join(static_root, hashed)
+            self.assertRegex(hashed, r'^base\.[0-9a-f]{12}\.css$')
+            with open(path, 'rb') as f, gzip.open(path + '.gz') as gz:
+                self.assertEqual(gz.read(), f.read())
@@ -14,11 +14,15 @@ Including another URLconf
     2. Add a URL to urlpatterns:  url(r'^blog/', include('blog.urls'))
 """
 from django.conf.urls import url
-from django.contrib import admin
 from lists import views 
 
 urlpatterns = [
     url(r'^new$', views.new_list, name='new_list'),
     url(r'^(\d+)/$', views.view_list, name='view_list'),
-    url(r'^(\d+)/add_item$', views.add_item, name='add_item')   
+    url(r'^(\d+)/add_item$', views.add_item, name='add_item'),
+    url(r'^(\d+)/add_items$', views.add_items, name='add_items'),
+    url(r'^(\d+)/events$', views.list_events, name='list_events'),
+    url(r'^(\d+)/items/(\d+)$', views.item_text, name='item_text'),
+    url(r'^(\d+)/export\.(csv|json|txt)$', views.export_list,
+        name='export_list'),
 ]
@@ -1,24 +1,308 @@
-from django.shortcuts import render, redirect
-from django.http import HttpResponse
-from lists.models import Item, List
+from django.conf import settings
+import csv
+import hashlib
+import json
+import time
+from functools import lru_cache
+
+from django.db import transaction
+from django.db.models import F
+from django.shortcuts import get_object_or_404, render, redirect
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, JsonResponse,
+    StreamingHttpResponse,
+)
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.middleware.csrf import get_token
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
+from django.views.decorators.http import condition, require_POST
+from lists import events
+from lists.cache import cached_fragment, invalidate_list
+from lists.models import Item, ItemTooLong, List
+from lists.writebehind import item_writer
+
+_CSRF_PLACEHOLDER = 'csrf-token-placeholder'
+
+@lru_cache(maxsize=None)
+def _static_home_page():
+    # rendered once per process, the CSRF token is filled in per request
+    return render_to_string('home.html', {'csrf_token': _CSRF_PLACEHOLDER})
 
 def home_page(request):
+    if settings.LISTS_STATIC_HOME:
+        return HttpResponse(
+            _static_home_page().replace(_CSRF_PLACEHOLDER, get_token(request)))
     return render(request, 'home.html')
 
+def _item_page(list_, after=None, before=None, size=None):
+    """
+    Keyset (cursor) pagination on Item.id : only fetch one page of
+    items, whatever the size of the list.
+    Returns (items, has_next, has_prev).
+    """
+    size = size or settings.LISTS_PAGE_SIZE
+    items = Item.objects.filter(list=list_)
+    if before is not None:
+        # walk backward from the cursor then put the page back in order
+        page = list(items.filter(id__lt=before).order_by('-id')[:size + 1])
+        has_prev = len(page) > size
+        page = page[:size][::-1]
+        return page, True, has_prev
+    if after is not None:
+        items = items.filter(id__gt=after)
+    page = list(items.order_by('id')[:size + 1])
+    return page[:size], len(page) > size, after is not None
+
+def _int_param(request, name):
+    try:
+        return int(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+
+def _get_list(request, list_id):
+    # loaded once per request, shared by the validators and the view
+    if not hasattr(request, '_list'):
+        list_ = get_object_or_404(List, id=list_id)
+        list_.ensure_restored()
+        list_.mark_viewed()
+        request._list = list_
+    return request._list
+
+def _list_etag(request, list_id):
+    list_ = _get_list(request, list_id)
+    # the page embeds a form token made from the CSRF cookie: a browser
+    # whose cookie changed, or was lost (a new one is made), must get a
+    # page with a new token rather than a 304
+    get_token(request)
+    cookie = hashlib.sha1(request.META['CSRF_COOKIE'].encode()).hexdigest()
+    return (f'{list_.id}-{list_.updated_at.timestamp()}-'
+            f'{request.GET.urlencode()}-{cookie[:12]}')
+
+def _list_last_modified(request, list_id):
+    # If-Modified-Since alone can't tell the CSRF cookie changed: no
+    # Last-Modified validation without one
+    if settings.CSRF_COOKIE_NAME not in request.COOKIES:
+        return None
+    return _get_list(request, list_id).updated_at
+
+# outside condition(): every response sets the CSRF cookie its page
+# was rendered with
+@ensure_csrf_cookie
+@condition(etag_func=_list_etag, last_modified_func=_list_last_modified)
 def view_list(request, list_id):
-    list_ = List.objects.get(id=list_id)
-    # items = Item.objects.filter(list=list_)
+    list_ = _get_list(request, list_id)
+    after = _int_param(request, 'after')
+    before = _int_param(request, 'before')
+    # position of the first row, carried by the cursors links
+    start = max(_int_param(request, 'start') or 1, 1)
+
+    def render_table():
+        size = settings.LISTS_PAGE_SIZE
+        items, has_next, has_prev = _item_page(
+            list_, after=after, before=before, size=size)
+        return render_to_string('list_table.html', {
+            'items': items,
+            'start': start,
+            'next_cursor': items[-1].id if has_next and items else None,
+            'next_start': start + len(items),
+            'prev_cursor': items[0].id if has_prev and items else None,
+            'prev_start': max(start - size, 1),
+            # live updates are appended to the last page only
+            'events_url': (
+                None if has_next else
+                f'/lists/{list_.id}/events?after={items[-1].id if items else 0}'),
+        })
+
     return render(request, 'list.html', {
-        # 'items': items,
         'list_': list_,
+        'table': cached_fragment(
+            list_, f'{after}:{before}:{start}', render_table),
     })
 
+def _too_long(error):
+    return HttpResponse(str(error), status=413, content_type='text/plain')
+
+def _last_page_url(list_id):
+    """
+    The page of the last item of the list, cut like the pages reached
+    through the next links: after add_item the new item is shown, and
+    the live updates run there.
+    """
+    size = settings.LISTS_PAGE_SIZE
+    count = List.objects.filter(id=list_id).values_list(
+        'item_count', flat=True).first() or 0
+    start = (max(count, 1) - 1) // size * size + 1
+    # the item before the page, found from the end: at most `size` rows
+    cursor = Item.objects.filter(list_id=list_id).order_by('-id').values_list(
+        'id', flat=True)[count - start + 1:count - start + 2]
+    if start == 1 or not cursor:
+        return f'/lists/{list_id}/'
+    return f'/lists/{list_id}/?after={cursor[0]}&start={start}'
+
 def new_list(request):
-    list_ = List.objects.create()
-    Item.objects.create(text=request.POST['item_text'], list=list_)
+    try:
+        item = Item.from_text(request.POST['item_text'])
+    except ItemTooLong as error:
+        return _too_long(error)
+    with transaction.atomic():
+        list_ = List.objects.create(item_count=1)
+        item.list_id = list_.id
+        item.save(force_insert=True)
+    invalidate_list(list_.id)
     return redirect(f'/lists/{list_.id}/')
 
 def add_item(request, list_id):
-    list_ = List.objects.get(id=list_id)
-    Item.objects.create(text=request.POST['item_text'], list=list_)
-    return redirect(f'/lists/{list_id}/')
\ No newline at end of file
+    text = request.POST['item_text']
+    try:
+        Item.check_text(text)
+    except ItemTooLong as error:
+        return _too_long(error)
+    if settings.LISTS_WRITE_COALESCING:
+        # the writer thread builds the item
+        try:
+            item_writer.add(list_id, text)
+        except List.DoesNotExist:
+            raise Http404('No such list')
+        except TimeoutError:
+            # the batch may still commit: a retry can add the item twice
+            return HttpResponse(
+                'The item was not saved in time, it may still be added',
+                status=503, content_type='text/plain')
+        return redirect(_last_page_url(list_id))
+    item = Item.from_text(text, list_id=list_id)
+    with transaction.atomic():
+        # bumping the stamp doubles as the existence check of the list
+        touched = List.objects.filter(id=list_id).update(
+            updated_at=timezone.now(), item_count=F('item_count') + 1)
+        if not touched:
+            raise Http404('No such list')
+        item.save(force_insert=True)
+    invalidate_list(list_id)
+    events.publish(list_id)
+    return redirect(_last_page_url(list_id))
+
+
+@csrf_exempt
+@require_POST
+def add_items(request, list_id):
+    """
+    Bulk add: the body is either a JSON array of texts or plain text
+    with one item per line.
+    """
+    list_ = get_object_or_404(List, id=list_id)
+    if request.content_type == 'application/json':
+        try:
+            texts = json.loads(request.body.decode('utf-8'))
+        except ValueError:
+            return HttpResponseBadRequest('Invalid JSON body')
+        if not isinstance(texts, list) or not all(
+                isinstance(text, str) for text in texts):
+            return HttpResponseBadRequest('Expected a JSON array of strings')
+    else:
+        try:
+            body = request.body.decode('utf-8')
+        except UnicodeDecodeError:
+            return HttpResponseBadRequest('Expected a UTF-8 text body')
+        texts = [line for line in body.splitlines() if line.strip()]
+    start = time.perf_counter()
+    try:
+        created = list_.add_items(texts)
+    except ItemTooLong as error:
+        return _too_long(error)
+    seconds = time.perf_counter() - start
+    invalidate_list(list_.id)
+    events.publish(list_.id)
+    return JsonResponse({
+        'list': list_.id,
+        'created': created,
+        'seconds': round(seconds, 6),
+        'items_per_second': round(created / seconds) if seconds else None,
+    })
+
+def list_events(request, list_id):
+    """
+    Server-Sent Events of the items added to the list (see lists.events),
+    after the Last-Event-ID of a reconnecting client, the `after` item
+    id, or from now on.
+    """
+    if not List.objects.filter(id=list_id).exists():
+        raise Http404('No such list')
+    try:
+        after = int(request.META.get('HTTP_LAST_EVENT_ID')
+                    or request.GET['after'])
+    except (KeyError, ValueError):
+        after = events.last_item_id(list_id)
+    response = StreamingHttpResponse(
+        events.stream(int(list_id), after), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # sent as they come, not buffered by nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def item_text(request, list_id, item_id):
+    """The whole text of an item, the list shows a preview of long ones."""
+    get_object_or_404(List, id=list_id).ensure_restored()
+    item = get_object_or_404(Item, id=item_id, list_id=list_id)
+    return HttpResponse(
+        item.get_full_text(), content_type='text/plain; charset=utf-8')
+
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'json': 'application/json',
+    'txt': 'text/plain',
+}
+
+def _iter_items(list_id, chunk_size=2000):
+    """
+    (id, whole text) of the items of a list, fetched by chunks on the
+    (list, id) index. Memory stays constant whatever the size of the
+    list, on SQLite as on PostgreSQL where Django 1.11 .iterator()
+    still loads the whole result.
+    """
+    last_id = 0
+    while True:
+        chunk = list(
+            Item.objects.filter(list_id=list_id, id__gt=last_id)
+            .order_by('id').values_list('id', 'text', 'full_text')[:chunk_size]
+        )
+        if not chunk:
+            return
+        for item_id, text, full_text in chunk:
+            yield item_id, Item.expand(text, full_text)
+        last_id = chunk[-1][0]
+
+class _Echo:
+    # file-like object for csv.writer, handing the rows back
+    def write(self, value):
+        return value
+
+def _csv_rows(items):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(['id', 'text'])
+    for item in items:
+        yield writer.writerow(item)
+
+def _json_rows(items):
+    separator = '['
+    for item_id, text in items:
+        yield separator + json.dumps({'id': item_id, 'text': text})
+        separator = ',\n'
+    yield ']\n' if separator != '[' else '[]\n'
+
+def _txt_rows(items):
+    for _, text in items:
+        yield text + '\n'
+
+def export_list(request, list_id, fmt):
+    get_object_or_404(List, id=list_id).ensure_restored()
+    rows = {'csv': _csv_rows, 'json': _json_rows, 'txt': _txt_rows}[fmt]
+    response = StreamingHttpResponse(
+        rows(_iter_items(list_id)),
+        content_type=f'{EXPORT_CONTENT_TYPES[fmt]}; charset=utf-8')
+    response['Content-Disposition'] = (
+        f'attachment; filename="list-{list_id}.{fmt}"')
+    # let nginx pass the first bytes on without buffering the export
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,161 @@
+"""
+Coalesced writes of add_item (LISTS_WRITE_COALESCING).
+
+Instead of one write transaction per request, the items are queued to a
+writer thread committing them by batches: one transaction, one
+bulk_create and one UPDATE per list, whatever the number of requests
+queued meanwhile. A request waits for the commit of its batch before
+being answered (group commit), so an acknowledged item is durable and
+the redirect to view_list always shows it.
+
+Batches form from the requests of the process queued while the previous
+batch commits, so this pays off with threaded or gevent workers.
+LISTS_WRITE_DELAY (seconds) waits a little longer for more items, which
+bounds the added latency; LISTS_WRITE_BATCH bounds the batch size.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from lists import events
+from lists.cache import invalidate_list
+from lists.models import Item, List
+
+
+logger = logging.getLogger('lists.writebehind')
+
+# queued by ItemWriter.stop
+_STOP = object()
+
+
+class _Pending:
+    def __init__(self, list_id, text):
+        self.list_id = int(list_id)
+        self.text = text
+        self.error = None
+        self.done = threading.Event()
+
+
+class ItemWriter:
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def add(self, list_id, text, timeout=30):
+        """
+        Queue an item and return once it is committed. Raises
+        List.DoesNotExist for a missing list, or the error of the batch.
+        TimeoutError after `timeout` seconds leaves the item queued: it
+        may still be committed later.
+        """
+        pending = _Pending(list_id, text)
+        self._ensure_started()
+        self._queue.put(pending)
+        if not pending.done.wait(timeout):
+            raise TimeoutError('Item not committed in time')
+        if pending.error is not None:
+            raise pending.error
+
+    def stop(self, timeout=None):
+        """
+        Stop the writer thread once the items queued before are
+        committed, and close its database connection.
+        """
+        with self._start_lock:
+            thread = self._thread
+            if thread is None or not thread.is_alive():
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='lists-item-writer', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + settings.LISTS_WRITE_DELAY
+        while (len(batch) < settings.LISTS_WRITE_BATCH
+               and batch[-1] is not _STOP):
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stopping = batch[-1] is _STOP
+            if stopping:
+                batch.pop()
+            if batch:
+                try:
+                    self.commit(batch)
+                except Exception:
+                    # keep the thread for the next batches; add() starts
+                    # a new one anyway if it dies
+                    logger.exception('Item writer batch failed')
+            if stopping:
+                connection.close()
+                return
+
+    def commit(self, batch):
+        # whatever happens, no request waits for its timeout
+        try:
+            try:
+                with transaction.atomic():
+                    counts = Counter(pending.list_id for pending in batch)
+                    existing = set(List.objects.filter(
+                        id__in=counts).values_list('id', flat=True))
+                    now = timezone.now()
+                    for list_id in existing:
+                        List.objects.filter(id=list_id).update(
+                            updated_at=now,
+                            item_count=F('item_count') + counts[list_id],
+                        )
+                    Item.objects.bulk_create([
+                        Item.from_text(pending.text, list_id=pending.list_id)
+                        for pending in batch if pending.list_id in existing
+                    ])
+            except Exception as error:
+                # a fresh connection for the next batch
+                connection.close()
+                for pending in batch:
+                    pending.error = error
+                return
+            for pending in batch:
+                if pending.list_id not in existing:
+                    pending.error = List.DoesNotExist(
+                        f'No list {pending.list_id}')
+            for list_id in existing:
+                # the items are committed: a failure here only leaves a
+                # stale cached page or a missed event
+                try:
+                    invalidate_list(list_id)
+                    events.publish(list_id)
+                except Exception:
+                    logger.exception(
+                        'Item writer post-commit of list %s failed', list_id)
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+
+item_writer = ItemWriter()
@@ -0,0 +1,38 @@
+"""
+Database connection hooks, connected when the lists app is ready.
+"""
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    Run the SQLITE_PRAGMAS of the settings on every new SQLite
+    connection (pragmas like synchronous or cache_size only last as
+    long as the connection).
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_persistent_connections(**kwargs):
+    """
+    Close persistent connections (CONN_MAX_AGE) that went bad while
+    idle, e.g. after a database restart, so the request reconnects
+    instead of failing on its first query.
+    """
+    if not getattr(settings, 'DB_HEALTH_CHECKS', False):
+        return
+    for conn in connections.all():
+        if conn.connection is not None and conn.settings_dict['CONN_MAX_AGE']:
+            if not conn.is_usable():
+                conn.close()
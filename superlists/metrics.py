@@ -0,0 +1,128 @@
+"""
+Per request instrumentation: wall time, database queries and template
+rendering time of each view.
+
+They are sent back in a Server-Timing header, logged as one JSON line
+on the `superlists.metrics` logger and added up in per worker counters
+served in the Prometheus text format by `metrics_view` (/metrics).
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.backends import utils as db_utils
+from django.http import Http404, HttpResponse
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger('superlists.metrics')
+
+_local = threading.local()
+_lock = threading.Lock()
+# view name -> [requests, seconds, db queries, db seconds, template seconds]
+_totals = defaultdict(lambda: [0, 0.0, 0, 0.0, 0.0])
+
+_COUNTERS = [
+    ('requests_total', 'Requests handled by this worker.'),
+    ('request_seconds_total', 'Wall time spent in the views.'),
+    ('db_queries_total', 'Database queries run.'),
+    ('db_seconds_total', 'Time spent running database queries.'),
+    ('template_seconds_total', 'Time spent rendering templates.'),
+]
+
+
+def _timed(func, index):
+    """
+    Wrap `func` to add its duration (and a call count for queries) to
+    the stats of the request in progress, if any.
+    """
+    def wrapper(*args, **kwargs):
+        stats = getattr(_local, 'stats', None)
+        if stats is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats[index] += time.perf_counter() - start
+            if index == 1:
+                stats[0] += 1
+    wrapper.__wrapped__ = func
+    return wrapper
+
+def _install():
+    # Django 1.11 has no hook around query execution nor template
+    # rendering outside of tests: wrap the methods once per process.
+    cursor = db_utils.CursorWrapper
+    if hasattr(cursor.execute, '__wrapped__'):
+        return
+    cursor.execute = _timed(cursor.execute, 1)
+    cursor.executemany = _timed(cursor.executemany, 1)
+    template = django_backend.Template
+    template.render = _timed(template.render, 2)
+
+
+class TimingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        _install()
+
+    def __call__(self, request):
+        # [db queries, db seconds, template seconds]
+        stats = _local.stats = [0, 0.0, 0.0]
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _local.stats = None
+        total = time.perf_counter() - start
+        queries, db_seconds, template_seconds = stats
+        view = getattr(request, '_metrics_view', 'unresolved')
+
+        response['Server-Timing'] = (
+            f'total;dur={total * 1000:.2f}, '
+            f'db;dur={db_seconds * 1000:.2f};desc="{queries} queries", '
+            f'tpl;dur={template_seconds * 1000:.2f}'
+        )
+        with _lock:
+            totals = _totals[view]
+            totals[0] += 1
+            totals[1] += total
+            totals[2] += queries
+            totals[3] += db_seconds
+            totals[4] += template_seconds
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'view': view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'ms': round(total * 1000, 3),
+                'db_queries': queries,
+                'db_ms': round(db_seconds * 1000, 3),
+                'template_ms': round(template_seconds * 1000, 3),
+            }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = view_func.__name__
+
+
+def metrics_view(request):
+    """Counters of this worker, for local scraping only."""
+    if (not settings.METRICS_ENDPOINT
+            or request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS):
+        raise Http404
+    with _lock:
+        totals = {view: list(values) for view, values in _totals.items()}
+    lines = []
+    for index, (name, help_text) in enumerate(_COUNTERS):
+        lines.append(f'# HELP superlists_{name} {help_text}')
+        lines.append(f'# TYPE superlists_{name} counter')
+        for view, values in sorted(totals.items()):
+            lines.append(f'superlists_{name}{{view="{view}"}} {values[index]}')
+    return HttpResponse(
+        '\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4')
@@ -47,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'superlists.metrics.TimingMiddleware',
+    'lists.middleware.RequestSizeLimitMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -74,6 +76,47 @@ TEMPLATES = [
     },
 ]
 
+# Production templates: compiled once by the cached loader and loaded at
+# worker boot (LISTS_PREWARM_TEMPLATES, see lists.apps) instead of on the
+# first requests. The home page, whose only dynamic part is the CSRF
+# token, is rendered once per process (LISTS_STATIC_HOME).
+
+if 'DJANGO_DEBUG_FALSE' in os.environ:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+LISTS_PREWARM_TEMPLATES = 'DJANGO_DEBUG_FALSE' in os.environ
+LISTS_STATIC_HOME = 'DJANGO_DEBUG_FALSE' in os.environ
+
+# Lean profile, opt-in with DJANGO_LEAN (set by the fabfile). The lists
+# have no login, sessions or flash messages: without those apps, their
+# middleware and context processors a worker imports less at boot and
+# does no session or user lookup per request. The CSRF token lives in
+# its cookie, not in the session, so the forms are unaffected.
+
+if 'DJANGO_LEAN' in os.environ:
+    INSTALLED_APPS = [
+        'django.contrib.staticfiles',
+
+        'lists',
+    ]
+    MIDDLEWARE = [
+        'superlists.metrics.TimingMiddleware',
+        'lists.middleware.RequestSizeLimitMiddleware',
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    ]
+    TEMPLATES[0]['OPTIONS']['context_processors'] = [
+        'django.template.context_processors.debug',
+        'django.template.context_processors.request',
+    ]
+
 WSGI_APPLICATION = 'superlists.wsgi.application'
 
 
@@ -83,10 +126,53 @@ WSGI_APPLICATION = 'superlists.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # DJANGO_SQLITE_PATH: outside of the release folders (fabfile)
+        'NAME': os.environ.get(
+            'DJANGO_SQLITE_PATH', os.path.join(BASE_DIR, 'db.sqlite3')),
     }
 }
 
+# PostgreSQL, with DJANGO_DB_ENGINE=postgresql (see the fabfile .env and
+# deploy_tools/provisioning_notes.md). Connections are kept open between
+# requests for DJANGO_DB_CONN_MAX_AGE seconds and checked at the start
+# of each request by superlists.db.check_persistent_connections.
+
+if os.environ.get('DJANGO_DB_ENGINE') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DJANGO_DB_NAME', 'superlists'),
+            'USER': os.environ.get('DJANGO_DB_USER', ''),
+            'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+            'HOST': os.environ.get('DJANGO_DB_HOST', ''),
+            'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 600)),
+        }
+    }
+DB_HEALTH_CHECKS = 'DJANGO_DB_NO_HEALTH_CHECKS' not in os.environ
+
+# Production SQLite tuning, opt-in with DJANGO_SQLITE_TUNING.
+# WAL lets readers run alongside the single writer instead of blocking
+# it, busy_timeout makes a writer wait for the lock rather than failing
+# with "database is locked", synchronous=NORMAL only syncs at WAL
+# checkpoints (still safe against corruption in WAL mode), mmap_size and
+# cache_size keep the hot pages in memory. The pragmas are run on each
+# new connection by superlists.db.apply_sqlite_pragmas. Ignored with
+# PostgreSQL, which refuses the `timeout` option.
+# See deploy_tools/provisioning_notes.md.
+
+if ('DJANGO_SQLITE_TUNING' in os.environ
+        and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'):
+    DATABASES['default']['OPTIONS'] = {'timeout': 20}
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'busy_timeout': 20000,  # ms
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,  # bytes
+        'cache_size': -64000,  # negative: KiB, i.e. 64MB per connection
+        'temp_store': 'MEMORY',
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -125,4 +211,93 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/1.11/howto/static-files/
 
 STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'static')
\ No newline at end of file
+STATIC_ROOT = os.environ.get(
+    'DJANGO_STATIC_ROOT', os.path.join(BASE_DIR, 'static'))
+
+# Production: hashed file names (cached forever by nginx) with gzip and
+# brotli copies made by collectstatic.
+if 'DJANGO_DEBUG_FALSE' in os.environ:
+    STATICFILES_STORAGE = 'superlists.storage.CompressedManifestStaticFilesStorage'
+
+# Lists
+# Number of items rendered per page of a list (keyset pagination on Item.id)
+
+LISTS_PAGE_SIZE = int(os.environ.get('LISTS_PAGE_SIZE', 50))
+
+# Size limits. Request bodies are refused (413) from their Content-Length
+# before being read (lists.middleware): LISTS_MAX_FORM_SIZE bytes for
+# the item forms, DATA_UPLOAD_MAX_MEMORY_SIZE for the bulk endpoints and
+# the API (nginx client_max_body_size matches it). Items are limited to
+# LISTS_MAX_ITEM_SIZE characters; past LISTS_ITEM_PREVIEW_SIZE only a
+# preview is rendered, the text is stored compressed.
+LISTS_MAX_ITEM_SIZE = int(os.environ.get('LISTS_MAX_ITEM_SIZE', 10000))
+LISTS_ITEM_PREVIEW_SIZE = 300
+LISTS_MAX_FORM_SIZE = 128 * 1024  # bytes, url-encoded
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # bytes
+
+# Coalesced add_item writes (lists.writebehind), opt-in: worth it with
+# threaded or gevent gunicorn workers.
+LISTS_WRITE_COALESCING = 'DJANGO_WRITE_COALESCING' in os.environ
+LISTS_WRITE_BATCH = 200
+LISTS_WRITE_DELAY = float(os.environ.get('DJANGO_WRITE_DELAY', 0))  # seconds
+
+# Live updates of the list page (lists.events). Streams are only kept
+# open with DJANGO_EVENTS_STREAM (gevent workers, set by the fabfile
+# for the async profile); otherwise the browser polls every
+# LISTS_EVENTS_POLL seconds through short requests.
+LISTS_EVENTS_STREAM = 'DJANGO_EVENTS_STREAM' in os.environ
+LISTS_EVENTS_TIMEOUT = 20  # seconds, below the gunicorn timeout
+LISTS_EVENTS_POLL = 2  # seconds
+
+
+# Cache
+# https://docs.djangoproject.com/en/1.11/topics/cache/
+# Rendered list tables are cached in LISTS_CACHE. Any Django backend can
+# be plugged in there; locally a size-bounded LRU in-memory cache, or a
+# file based one when DJANGO_CACHE_DIR is set.
+
+if 'DJANGO_CACHE_DIR' in os.environ:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['DJANGO_CACHE_DIR'],
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'lists.cache.LRULocMemCache',
+            'LOCATION': 'superlists',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        }
+    }
+
+LISTS_CACHE = 'default'
+LISTS_CACHE_TIMEOUT = 60 * 60
+
+
+
+# Metrics
+# superlists.metrics.TimingMiddleware times every request (Server-Timing
+# header, JSON log lines on the superlists.metrics logger). The /metrics
+# endpoint (Prometheus text format, counters of one worker) is opt-in
+# and only answers local requests.
+
+METRICS_ENDPOINT = 'DJANGO_METRICS_ENDPOINT' in os.environ
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'superlists.metrics': {
+            'handlers': ['console'],
+            'level': 'INFO' if 'DJANGO_DEBUG_FALSE' in os.environ else 'WARNING',
+            'propagate': False,
+        },
+    },
+}
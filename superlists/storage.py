@@ -0,0 +1,41 @@
+"""
+Static files storage for production: hashed file names from the
+manifest storage, plus .gz (and .br when brotli is installed) copies
+of the text files for nginx's gzip_static/brotli_static.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+COMPRESSED_EXTENSIONS = ('.css', '.js', '.svg', '.eot', '.ttf', '.json', '.txt')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if not dry_run:
+            for hashed_name in sorted(hashed_names):
+                if hashed_name.endswith(COMPRESSED_EXTENSIONS):
+                    self.compress(hashed_name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            content = f.read()
+        # mtime=0: the same file always gives the same .gz
+        with gzip.GzipFile(path + '.gz', 'wb', compresslevel=9, mtime=0) as f:
+            f.write(content)
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(content))
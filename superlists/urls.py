@@ -14,10 +14,14 @@ Including another URLconf
     2. Add a URL to urlpatterns:  url(r'^blog/', include('blog.urls'))
 """
 from django.conf.urls import include, url
+from lists import api_urls as lists_api_urls
 from lists import urls as lists_urls
 from lists import views as lists_views
+from superlists import metrics
 
 urlpatterns = [
     url(r'^$', lists_views.home_page, name='home'),
     url(r'^lists/', include(lists_urls)),  
+    url(r'^api/', include(lists_api_urls)),
+    url(r'^metrics$', metrics.metrics_view, name='metrics'),
 ]